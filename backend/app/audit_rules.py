@@ -0,0 +1,114 @@
+# audit_rules.py
+import datetime
+
+# name -> AuditRule, in registration (and report) order
+AUDIT_RULES = {}
+
+DEFAULT_PARAMS = {
+    "reviewer": "Alice",
+    "waiting_hours": 24,
+    "merged_days": 7,
+}
+
+
+class AuditRule:
+    __slots__ = ("name", "indexes", "evaluate")
+
+    def __init__(self, name, indexes, evaluate):
+        self.name = name
+        self.indexes = indexes
+        self.evaluate = evaluate
+
+
+class Section:
+    """
+    One audit result: a title ("{count}" is replaced by the row count when
+    formatted), column names and rows of values in column order.
+    """
+    __slots__ = ("title", "columns", "rows")
+
+    def __init__(self, title, columns, rows):
+        self.title = title
+        self.columns = columns
+        self.rows = rows
+
+    def format(self):
+        return (
+            self.title.replace("{count}", str(len(self.rows))) + "\n"
+            + " | ".join(self.columns) + "\n"
+            + "\n".join([" | ".join(str(value) for value in row) for row in self.rows])
+        )
+
+
+def audit_rule(name, indexes=()):
+    """
+    Registers fn(table, params) -> Section as an audit rule. `indexes` names
+    the PRTable indexes the rule reads, so they are built up front.
+    """
+    def register(fn):
+        AUDIT_RULES[name] = AuditRule(name, tuple(indexes), fn)
+        return fn
+    return register
+
+
+def evaluate_rules(prs, rules=None, **params):
+    """
+    Evaluates the given rules (default: all registered) over one PRTable and
+    returns {rule name: Section}. Each needed index is built once.
+    """
+    from app.pr_table import PRTable  # keeps pandas out of import time
+    table = prs if isinstance(prs, PRTable) else PRTable.from_prs(prs)
+    rules = [AUDIT_RULES[name] for name in rules] if rules else list(AUDIT_RULES.values())
+    params = {**DEFAULT_PARAMS, "now": datetime.datetime.utcnow(), **params}
+
+    for name in {index for rule in rules for index in rule.indexes}:
+        table.index(name)
+    return {rule.name: rule.evaluate(table, params) for rule in rules}
+
+
+def run_audit(prs, rules=None, **params):
+    """Like evaluate_rules, but returns {rule name: section text}."""
+    return {name: section.format() for name, section in evaluate_rules(prs, rules, **params).items()}
+
+
+@audit_rule("merged_without_approval", indexes=("merged_sorted", "approved_numbers"))
+def merged_without_approval(table, params):
+    rows = table.merged_without_approval()
+    return Section(
+        "PRs merged without approval: {count}",
+        ["PR ID", "Title", "Merged By", "Reviews"],
+        [[pr.number, pr.title, pr.merged_by, []] for pr in rows.itertuples()],
+    )
+
+
+@audit_rule("reviewed_by", indexes=("by_reviewer", "title_by_number"))
+def reviewed_by(table, params):
+    reviewer = params["reviewer"]
+    rows = table.reviewed_by(reviewer)
+    return Section(
+        f"PRs reviewed by {reviewer}:",
+        ["PR ID", "Title", "Reviewer", "Decision", "Date"],
+        [[rev.number, rev.title, rev.login, rev.state, rev.submitted_at] for rev in rows.itertuples()],
+    )
+
+
+@audit_rule("waiting_for_review", indexes=("by_state",))
+def waiting_for_review(table, params):
+    hours = params["waiting_hours"]
+    rows = table.waiting_for_review(hours, params["now"])
+    return Section(
+        f"PRs waiting >{hours}h for review:",
+        ["PR ID", "Title", "Created At", "Review Requested", "Waiting Hours"],
+        [[pr.number, pr.title, f"{pr.created_at:%Y-%m-%dT%H:%M:%SZ}", False, pr.waiting_hours] for pr in rows.itertuples()],
+    )
+
+
+@audit_rule("merged_recently", indexes=("merged_sorted", "by_review_state"))
+def merged_recently(table, params):
+    days = params["merged_days"]
+    rows = table.merged_since(params["now"] - datetime.timedelta(days=days))
+    return Section(
+        f"PRs merged in last {days} days:",
+        ["PR ID", "Title", "Merged At", "Approvers"],
+        [[pr.number, pr.title, f"{pr.merged_at:%Y-%m-%dT%H:%M:%SZ}", pr.approvers] for pr in rows.itertuples()],
+    )
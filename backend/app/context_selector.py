@@ -0,0 +1,92 @@
+# context_selector.py
+import os
+import re
+import threading
+
+CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "8000"))
+
+# Section -> query keywords that make it relevant. Sections nothing matches are
+# dropped; if the query matches no section at all, every section is kept.
+SECTION_KEYWORDS = {
+    "repository": ["repo", "star", "fork", "license", "description", "default branch"],
+    "branches": ["branch", "commit"],
+    "issues": ["issue", "bug", "label", "assign", "ticket"],
+    "merged_without_approval": ["approv", "without", "merged", "bypass", "unreviewed"],
+    "reviewed_by": ["reviewed by", "reviewer", "reviewed"],
+    "waiting_for_review": ["waiting", "pending", "hour", "stale", "open", "24"],
+    "merged_recently": ["recent", "last", "week", "days", "merged"],
+}
+# Always sent: tiny and anchors the answer to the right repo
+ALWAYS_INCLUDED = ("repository",)
+# Lines at the top of a section that are kept whole (title, column header)
+HEADER_LINES = {"repository": None, "branches": 1, "issues": 1}
+STOPWORDS = {"the", "and", "for", "are", "how", "many", "what", "which", "with", "have", "has", "been", "show", "all", "prs", "list", "who"}
+
+metrics = {"queries": 0, "tokens_before": 0, "tokens_after": 0, "last": None}
+_metrics_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    # ~4 characters per token is close enough for budgeting Gemini prompts
+    return len(text) // 4 + 1
+
+
+def route_sections(query, section_names):
+    q = query.lower()
+    chosen = [name for name in section_names if any(k in q for k in SECTION_KEYWORDS.get(name, ()))]
+    if not chosen:
+        return list(section_names)
+    return [name for name in section_names if name in ALWAYS_INCLUDED or name in chosen]
+
+
+def query_terms(query):
+    return {t for t in re.findall(r"[a-z0-9_\-]+", query.lower()) if len(t) > 2 and t not in STOPWORDS}
+
+
+def select_context(query, sections, budget=CONTEXT_TOKEN_BUDGET):
+    """
+    Keeps only the sections relevant to the query and, if they exceed the
+    token budget, the rows that best match the query terms. Returns
+    {section name: text} in the original section order.
+    """
+    tokens_before = sum(estimate_tokens(text) for text in sections.values())
+    names = route_sections(query, list(sections))
+    terms = query_terms(query)
+
+    heads, rows = {}, []
+    for name in names:
+        lines = sections[name].split("\n")
+        header_lines = HEADER_LINES.get(name, 2)
+        if header_lines is None:
+            header_lines = len(lines)
+        heads[name] = lines[:header_lines]
+        for position, line in enumerate(lines[header_lines:]):
+            if line:
+                score = sum(1 for t in terms if t in line.lower())
+                rows.append((-score, name, position, line))
+
+    remaining = budget - sum(estimate_tokens("\n".join(h)) for h in heads.values())
+    kept = {name: [] for name in names}
+    dropped = {name: 0 for name in names}
+    for _, name, position, line in sorted(rows, key=lambda r: r[0]):  # stable: best score, then original order
+        cost = estimate_tokens(line)
+        if cost <= remaining:
+            kept[name].append((position, line))
+            remaining -= cost
+        else:
+            dropped[name] += 1
+
+    selected = {}
+    for name in names:
+        lines = heads[name] + [line for _, line in sorted(kept[name])]
+        if dropped[name]:
+            lines.append(f"... ({dropped[name]} more rows omitted)")
+        selected[name] = "\n".join(lines)
+
+    tokens_after = sum(estimate_tokens(text) for text in selected.values())
+    with _metrics_lock:
+        metrics["queries"] += 1
+        metrics["tokens_before"] += tokens_before
+        metrics["tokens_after"] += tokens_after
+        metrics["last"] = {"sections": names, "tokens_before": tokens_before, "tokens_after": tokens_after}
+    return selected
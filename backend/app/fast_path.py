@@ -0,0 +1,138 @@
+# fast_path.py
+import datetime
+import re
+
+# Questions asking for more than a table lookup go to the LLM
+FREE_FORM_HINTS = ("why", "explain", "summar", "compare", "trend", "commit", "risk", "recommend", "should")
+
+_DURATION = r"(\d+)\s*(h|hrs?|hours?|d|days?|w|weeks?)\b"
+_UNIT_HOURS = {"h": 1, "d": 24, "w": 24 * 7}
+_MONTHS = ("january|february|march|april|june|july|august|september|october|november|december"
+           "|jan|feb|mar|apr|jun|jul|aug|sep|sept|oct|nov|dec")
+_WEEKDAYS = r"(mon|tues|wednes|thurs|fri|satur|sun)day"
+# A time window on top of another check ("reviewed by alice in the last 7 days", "... in 2024") is for the LLM
+_TIME_WINDOW = re.compile(
+    r"\b(last|past|since|within|before|after|between|until|ago|recent\w*|this\s+(week|month|year)|today|yesterday"
+    rf"|{_MONTHS}|{_WEEKDAYS}|(19|20)\d{{2}})\b|" + _DURATION
+)
+# So is a negation or exclusion the canned answer would ignore ("not merged", "except dependabot")
+_NEGATION = re.compile(r"\b(not|never|except|excluding|without|other\s+than|non)\b|n't\b")
+_RECENT_WINDOW = re.compile(r"\b(last|past)\s+(\d+\s*)?(days?|weeks?|d|w)\b|\bthis\s+week\b")
+
+INTENT_PATTERNS = {
+    "merged_without_approval": re.compile(
+        r"merged\b.*\b(without|no|missing|lacking)\b.*\bapprov|unapproved\b.*\bmerged|bypass\w*\b.*\breview"
+    ),
+    "reviewed_by": re.compile(r"\b(reviewed|approved)\s+by\s+@?([a-z0-9][a-z0-9-]*)|\breviews?\s+(?:by|from)\s+@?([a-z0-9][a-z0-9-]*)"),
+    "waiting_for_review": re.compile(r"\b(waiting|pending|awaiting|stuck)\b.*\breview"),
+    "merged_recently": re.compile(r"\bmerged\b.*\b(last|past)\s+(\d+\s*)?(days?|weeks?|d|w)\b|\bmerged\b.*\bthis\s+week\b"),
+}
+
+
+def _hours(match, default):
+    if not match:
+        return default
+    return int(match.group(1)) * _UNIT_HOURS.get(match.group(2)[0], 1)
+
+
+def match_intent(query):
+    """
+    Maps a canonical audit question to (intent, params), or None when the
+    question is free-form or matches more than one intent.
+    """
+    q = query.lower()
+    if any(hint in q for hint in FREE_FORM_HINTS):
+        return None
+    matches = {name: m for name, pattern in INTENT_PATTERNS.items() if (m := pattern.search(q))}
+    # "merged without approval in the last 7 days" combines two checks
+    if "merged_without_approval" in matches and "merged_recently" in matches:
+        return None
+    # "waiting for review by bob" is not a question about bob's reviews: two matches, LLM
+    if len(matches) != 1:
+        return None
+
+    intent, m = next(iter(matches.items()))
+    # The rest of the question, minus the intent's own wording ("merged without approval")
+    # and parameter ("more than 48 hours", "in the last 7 days"), must add no constraint
+    if intent == "merged_without_approval":
+        rest = q[:m.start()] + " " + q[m.end():]
+    elif intent == "waiting_for_review":
+        rest = re.sub(_DURATION, " ", q, count=1)
+    elif intent == "merged_recently":
+        rest = _RECENT_WINDOW.sub(" ", q, count=1)
+    else:
+        rest = q
+    if _TIME_WINDOW.search(rest) or _NEGATION.search(rest):
+        return None
+
+    if intent == "reviewed_by":
+        return intent, {"reviewer": m.group(2) or m.group(3), "approved_only": m.group(1) == "approved"}
+    if intent == "waiting_for_review":
+        return intent, {"hours": _hours(re.search(_DURATION, q), 24)}
+    if intent == "merged_recently":
+        duration = re.search(r"(\d+)\s*(d|days?|w|weeks?)\b", q)
+        return intent, {"days": _hours(duration, 24 * 7) // 24}
+    return intent, {}
+
+
+def _time(value):
+    return value.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _plural(n, word):
+    return f"{n} {word}" + ("" if n == 1 else "s")
+
+
+def answer_intent(table, intent, params, now=None):
+    """
+    Builds the {description, csv} answer for a matched intent from a PRTable.
+    """
+    now = now or datetime.datetime.utcnow()
+    if intent == "merged_without_approval":
+        rows = table.merged_without_approval()
+        csv = [{"PR ID": int(pr.number), "Title": pr.title, "Merged By": pr.merged_by, "Reviews": []}
+               for pr in rows.itertuples()]
+        description = f"{_plural(len(csv), 'PR')} {'was' if len(csv) == 1 else 'were'} merged without an approving review."
+    elif intent == "reviewed_by":
+        reviewer = params["reviewer"]
+        rows = table.reviewed_by(reviewer)
+        if params.get("approved_only"):
+            rows = rows[rows["state"] == "APPROVED"]
+        csv = [{"PR ID": int(rev.number), "Title": rev.title, "Reviewer": rev.login, "Decision": rev.state, "Date": rev.submitted_at}
+               for rev in rows.itertuples()]
+        prs = _plural(len({r['PR ID'] for r in csv}), 'PR')
+        if params.get("approved_only"):
+            description = f"{reviewer} approved {prs}."
+        else:
+            description = f"{reviewer} submitted {_plural(len(csv), 'review')} across {prs}."
+    elif intent == "waiting_for_review":
+        hours = params["hours"]
+        rows = table.waiting_for_review(hours, now)
+        csv = [{"PR ID": int(pr.number), "Title": pr.title, "Created At": _time(pr.created_at),
+                "Review Requested": False, "Waiting Hours": float(pr.waiting_hours)}
+               for pr in rows.itertuples()]
+        description = (f"{_plural(len(csv), 'open PR')} {'has' if len(csv) == 1 else 'have'} been waiting more than "
+                       f"{hours} hours with no reviewer requested.")
+    else:
+        days = params["days"]
+        rows = table.merged_since(now - datetime.timedelta(days=days))
+        csv = [{"PR ID": int(pr.number), "Title": pr.title, "Merged At": _time(pr.merged_at), "Approvers": pr.approvers}
+               for pr in rows.itertuples()]
+        unapproved = sum(1 for r in csv if not r["Approvers"])
+        description = f"{_plural(len(csv), 'PR')} merged in the last {days} days; {unapproved} without an approval."
+    return {"description": description, "csv": csv}
+
+
+def answer_canonical(query, table, now=None):
+    """
+    Deterministic answer for a canonical audit question, or None if the
+    question should go to the LLM.
+    """
+    matched = match_intent(query)
+    if matched is None:
+        return None
+    intent, params = matched
+    # "approved by someone/the/more ..." captures a word, not a login: only known reviewers take the fast path
+    if intent == "reviewed_by" and params["reviewer"].lower() not in table.index("by_reviewer"):
+        return None
+    return answer_intent(table, intent, params, now)
@@ -0,0 +1,149 @@
+# github_cache.py
+import os
+import sqlite3
+import threading
+import time
+
+from dotenv import load_dotenv, find_dotenv
+load_dotenv(find_dotenv(), override=False)
+
+CACHE_ENABLED = os.getenv("GITHUB_CACHE", "1") != "0"
+CACHE_PATH = os.getenv(
+    "GITHUB_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "github.sqlite"),
+)
+CACHE_MAX_BYTES = int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+# Seconds an entry is served without asking GitHub at all; after that it is
+# revalidated with If-None-Match / If-Modified-Since (a 304 costs no quota).
+CACHE_TTLS = {
+    "default": int(os.getenv("GITHUB_CACHE_TTL", "60")),
+    "reviews": int(os.getenv("GITHUB_CACHE_TTL_REVIEWS", "3600")),
+}
+
+
+def ttl_for(url):
+    path = url.split("?", 1)[0]
+    if path.endswith("/reviews"):
+        return CACHE_TTLS["reviews"]
+    return CACHE_TTLS["default"]
+
+
+class CacheEntry:
+    __slots__ = ("url", "etag", "last_modified", "body", "next_url", "fetched_at")
+
+    def __init__(self, url, etag, last_modified, body, next_url, fetched_at):
+        self.url = url
+        self.etag = etag
+        self.last_modified = last_modified
+        self.body = body
+        self.next_url = next_url
+        self.fetched_at = fetched_at
+
+    def is_fresh(self):
+        return time.time() - self.fetched_at < ttl_for(self.url)
+
+    def conditional_headers(self):
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class GitHubCache:
+    """
+    SQLite store of GitHub GET responses keyed by full URL, evicted least
+    recently used first once the stored bodies exceed max_bytes.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body TEXT NOT NULL,
+                next_url TEXT,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL,
+                size INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self._conn.commit()
+        # Running total of stored body bytes, so puts only scan the table when over the limit
+        self._total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT url, etag, last_modified, body, next_url, fetched_at FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        return CacheEntry(*row)
+
+    def put(self, url, etag, last_modified, body, next_url):
+        now = time.time()
+        # Bytes as stored (UTF-8), not characters: non-ASCII titles and bodies count in full
+        size = len(body.encode())
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE url = ?", (url,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, next_url, now, now, size),
+            )
+            self._total += size - (old[0] if old else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def refresh(self, url):
+        """Marks an entry as freshly validated after a 304."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ?, last_access = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+            self._total = 0
+
+    def _evict(self):
+        # Least recently used first, until the running total is back under the limit
+        cursor = self._conn.execute("SELECT url, size FROM responses ORDER BY last_access")
+        victims = []
+        for url, size in cursor:
+            victims.append((url,))
+            self._total -= size
+            if self._total <= self.max_bytes:
+                break
+        cursor.close()
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", victims)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    if not CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = GitHubCache()
+    return _cache
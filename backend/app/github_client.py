@@ -0,0 +1,325 @@
+# github_client.py
+import os
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv, find_dotenv
+from app.github_cache import get_cache
+from app.records import PullRecord, ReviewRecord, json_loads
+load_dotenv(find_dotenv(), override=False)
+
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", GITHUB_API_URL + "/graphql")
+# "rest" (default) or "graphql": which API the context builders and sync read from
+DATA_SOURCE = os.getenv("GITHUB_DATA_SOURCE", "rest").lower()
+# Upper bound on in-flight GitHub requests; also sizes the connection pool
+MAX_WORKERS = int(os.getenv("GITHUB_MAX_WORKERS", "16"))
+# Global cap on simultaneous GitHub requests across all pools (e.g. an org scan)
+MAX_CONCURRENT_REQUESTS = int(os.getenv("GITHUB_MAX_CONCURRENT_REQUESTS", "32"))
+PER_PAGE = 100
+# Retries for 5xx, connection errors and rate limiting, with full-jitter exponential backoff
+MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "5"))
+BACKOFF_BASE = float(os.getenv("GITHUB_BACKOFF_BASE", "1"))
+BACKOFF_MAX = float(os.getenv("GITHUB_BACKOFF_MAX", "60"))
+# Longest we will sleep for a rate-limit window before giving up with an error
+MAX_RATE_LIMIT_WAIT = float(os.getenv("GITHUB_MAX_RATE_LIMIT_WAIT", "300"))
+# Below this many remaining requests, spread the rest evenly until the reset
+PACE_BELOW = int(os.getenv("GITHUB_PACE_BELOW", "500"))
+REQUEST_TIMEOUT = float(os.getenv("GITHUB_TIMEOUT", "30"))
+
+headers = {
+    "Authorization": f"token {GITHUB_TOKEN}",
+    "Accept": "application/vnd.github.v3+json"
+}
+
+_session = None
+_session_lock = threading.Lock()
+
+# Last quota GitHub reported (X-RateLimit-* headers) per resource, for schedulers to pace themselves
+rate_limits = {"core": {"remaining": None, "reset": None}, "graphql": {"remaining": None, "reset": None}}
+rate_limit = rate_limits["core"]
+_request_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+
+# Per-repo request accounting ("owner/repo" -> counters), exposed via quota_metrics()
+_repo_metrics = defaultdict(lambda: {"requests": 0, "cache_hits": 0, "retries": 0, "throttled": 0, "errors": 0, "wait_seconds": 0.0})
+_metrics_lock = threading.Lock()
+_pace_lock = threading.Lock()
+_next_request_at = {}
+
+RETRY_STATUSES = {500, 502, 503, 504}
+
+
+class GitHubAPIError(Exception):
+    """
+    A GitHub request that failed for good: a non-retryable status, retries
+    exhausted, or a rate-limit reset too far away to wait for.
+    """
+
+    def __init__(self, status, url, message, retry_after=None):
+        super().__init__(f"GitHub {status} for {url}: {message}")
+        self.status = status
+        self.url = url
+        self.message = message
+        self.retry_after = retry_after
+
+
+def get_session():
+    """
+    One requests.Session shared by every caller so keep-alive connections are reused.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                session.headers.update(headers)
+                pool_size = max(MAX_WORKERS, MAX_CONCURRENT_REQUESTS)
+                adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _session = session
+    return _session
+
+
+def repo_key(url):
+    parts = urlparse(url).path.strip("/").split("/")
+    if len(parts) >= 3 and parts[0] == "repos":
+        return f"{parts[1]}/{parts[2]}"
+    if len(parts) >= 2 and parts[0] == "orgs":
+        return parts[1]
+    return "other"
+
+
+def _count(key, field, amount=1):
+    with _metrics_lock:
+        _repo_metrics[key][field] += amount
+
+
+def quota_metrics():
+    with _metrics_lock:
+        repos = {key: dict(counters) for key, counters in _repo_metrics.items()}
+    return {"rate_limit": {name: dict(limit) for name, limit in rate_limits.items()}, "repos": repos}
+
+
+def _record_rate_limit(response, resource):
+    if "X-RateLimit-Remaining" in response.headers:
+        limit = rate_limits.get(response.headers.get("X-RateLimit-Resource"), rate_limits[resource])
+        limit["remaining"] = int(response.headers["X-RateLimit-Remaining"])
+        limit["reset"] = int(response.headers.get("X-RateLimit-Reset", 0))
+
+
+def backoff(attempt):
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+
+def _pace(resource, url):
+    """
+    Once the remaining quota drops below PACE_BELOW, hands out request slots
+    spaced (reset - now) / remaining apart, so the budget lasts until the reset
+    instead of running dry and failing. Returns the seconds waited.
+    """
+    remaining, reset = rate_limits[resource]["remaining"], rate_limits[resource]["reset"]
+    if remaining is None or remaining >= PACE_BELOW or not reset:
+        return 0
+    window = max(0, reset - time.time())
+    if remaining == 0 and window > MAX_RATE_LIMIT_WAIT:
+        raise GitHubAPIError(403, url, "rate limit exhausted", retry_after=window)
+    interval = window / max(remaining, 1)
+    with _pace_lock:
+        now = time.monotonic()
+        slot = max(now, _next_request_at.get(resource, 0))
+        _next_request_at[resource] = slot + interval
+    wait = slot - now
+    if wait > 0:
+        time.sleep(wait)
+    return wait
+
+
+def retry_delay(response, attempt):
+    """
+    Seconds to wait before retrying `response`, or None if it should not be
+    retried. Honours Retry-After and the primary limit's reset time; secondary
+    limits and 5xx fall back to jittered backoff.
+    """
+    status = response.status_code
+    if status in RETRY_STATUSES:
+        return backoff(attempt)
+    if status not in (403, 429):
+        return None
+    if "Retry-After" in response.headers:
+        return float(response.headers["Retry-After"])
+    if response.headers.get("X-RateLimit-Remaining") == "0":
+        return max(0, int(response.headers.get("X-RateLimit-Reset", 0)) - time.time()) + 1
+    if status == 429 or "rate limit" in response.text.lower():
+        return backoff(attempt)
+    return None  # a plain permission error
+
+
+def request(method, url, key=None, resource="core", **kwargs):
+    """
+    Sends one GitHub request over the shared session with proactive pacing,
+    retries and rate-limit handling. Returns the final response, which may
+    still be an error status the caller has to check; raises GitHubAPIError
+    when retries run out or the limit resets too far in the future.
+    """
+    key = key or repo_key(url)
+    for attempt in range(MAX_RETRIES + 1):
+        waited = _pace(resource, url)
+        response = None
+        try:
+            with _request_slots:
+                response = get_session().request(method, url, timeout=REQUEST_TIMEOUT, **kwargs)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            delay, reason = backoff(attempt), str(e)
+        else:
+            _record_rate_limit(response, resource)
+            delay, reason = retry_delay(response, attempt), response.reason
+        _count(key, "requests")
+        _count(key, "wait_seconds", waited)
+        if delay is None:
+            return response
+        status = response.status_code if response is not None else None
+        if status in (403, 429):
+            _count(key, "throttled")
+        if attempt == MAX_RETRIES or delay > MAX_RATE_LIMIT_WAIT:
+            _count(key, "errors")
+            raise GitHubAPIError(status, url, reason, retry_after=delay)
+        print(f"⏳ GitHub {status or 'connection error'} for {url}, retrying in {delay:.1f}s")
+        _count(key, "retries")
+        _count(key, "wait_seconds", delay)
+        time.sleep(delay)
+
+
+def raise_for_status(response, url):
+    if response.status_code >= 400:
+        try:
+            message = response.json().get("message")
+        except ValueError:
+            message = response.text[:200]
+        _count(repo_key(url), "errors")
+        raise GitHubAPIError(response.status_code, url, message)
+
+
+def get_page(url, params=None, revalidate=False):
+    """
+    GETs a GitHub URL through the local cache and returns (payload, next_url).
+
+    Fresh entries are served from disk; stale ones are revalidated with their
+    ETag / Last-Modified and a 304 is answered from the stored body.
+    revalidate=True always asks GitHub (conditionally), even within the TTL.
+    """
+    if params:
+        url = requests.Request("GET", url, params=params).prepare().url
+    cache = get_cache()
+    entry = cache.get(url) if cache else None
+    if entry and entry.is_fresh() and not revalidate:
+        _count(repo_key(url), "cache_hits")
+        return json_loads(entry.body), entry.next_url
+
+    response = request("GET", url, headers=entry.conditional_headers() if entry else None)
+    if response.status_code == 304 and entry:
+        cache.refresh(url)
+        return json_loads(entry.body), entry.next_url
+    raise_for_status(response, url)
+
+    next_url = response.links.get("next", {}).get("url")
+    if cache and response.status_code == 200:
+        cache.put(url, response.headers.get("ETag"), response.headers.get("Last-Modified"), response.text, next_url)
+    return json_loads(response.content), next_url
+
+
+def quota_wait_seconds(floor):
+    """
+    Seconds to hold off until the rate-limit window resets, if GitHub last
+    reported fewer than `floor` requests remaining; otherwise 0.
+    """
+    remaining, reset = rate_limit["remaining"], rate_limit["reset"]
+    if remaining is not None and remaining < floor and reset:
+        return max(0, reset - time.time()) + 1
+    return 0
+
+
+def post_graphql(query, variables=None, url=None):
+    """
+    Runs a GraphQL query over the shared session. Not cached: GraphQL
+    responses carry no ETags and the query body is the key.
+    """
+    variables = variables or {}
+    url = url or GITHUB_GRAPHQL_URL
+    key = f"{variables['owner']}/{variables['repo']}" if "owner" in variables and "repo" in variables else "graphql"
+    response = request("POST", url, key=key, resource="graphql", json={"query": query, "variables": variables})
+    raise_for_status(response, url)
+    return json_loads(response.content)
+
+
+def get_json(url, params=None):
+    return get_page(url, params)[0]
+
+
+def iter_pages(url, params=None, revalidate=False):
+    """
+    Yields records from a GitHub list endpoint one page at a time, following
+    the Link: rel="next" header until the last page.
+    """
+    while url:
+        page, next_url = get_page(url, params, revalidate)
+        if not isinstance(page, list):
+            raise GitHubAPIError(200, url, "expected a list response")
+        yield from page
+        url = next_url
+        params = None  # the next link already carries the query string
+
+
+def iter_pulls(owner, repo, state="all", **params):
+    # Projected to PullRecords page by page; the raw payloads are dropped right away
+    url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/pulls"
+    return map(PullRecord.from_github, iter_pages(url, {"state": state, "per_page": PER_PAGE, **params}))
+
+
+def iter_issues(owner, repo, state="all", **params):
+    url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/issues"
+    return iter_pages(url, {"state": state, "per_page": PER_PAGE, **params})
+
+
+def iter_reviews(pr_url, revalidate=False):
+    pages = iter_pages(pr_url + "/reviews", {"per_page": PER_PAGE}, revalidate)
+    return map(ReviewRecord.from_github, pages)
+
+
+def iter_pulls_with_reviews(owner, repo, state="all", max_workers=MAX_WORKERS):
+    """
+    Streams PRs with reviews attached, one page-sized batch in memory at a time.
+    """
+    pulls = iter_pulls(owner, repo, state)
+    while True:
+        batch = list(islice(pulls, PER_PAGE))
+        if not batch:
+            return
+        yield from fetch_reviews(batch, max_workers)
+
+
+def fetch_reviews(prs, max_workers=MAX_WORKERS, revalidate=False):
+    """
+    Returns the PullRecords with reviews attached, fetching closed PRs' reviews
+    concurrently (open PRs keep none, as before). revalidate=True bypasses the
+    cache TTL, for PRs known to have changed.
+    """
+    prs = list(prs)
+    closed = [n for n, pr in enumerate(prs) if pr.state == "closed" and pr.url]
+    if not closed:
+        return prs
+
+    workers = max(1, min(max_workers, len(closed)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(lambda n: tuple(iter_reviews(prs[n].url, revalidate)), closed)
+        for n, reviews in zip(closed, results):
+            prs[n] = prs[n].with_reviews(reviews)
+    return prs
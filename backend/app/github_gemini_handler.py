@@ -1,125 +1,54 @@
 # github_gemini_handler.py
-import google.generativeai as genai
-import requests
-import datetime
+import asyncio
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from dotenv import load_dotenv, find_dotenv
-import pandas as pd
-import re
-import json
+from app.github_client import DATA_SOURCE, GITHUB_API_URL, PER_PAGE, get_json, iter_pages, iter_issues, iter_pulls_with_reviews
+from app import github_graphql
+from app.sync_store import SYNC_ENABLED, sync_repo, iter_synced_pulls, iter_synced_issues
+from app.prefetch import SnapshotScheduler
+from app.records import IssueRecord, RepoInfo
+from app.repo_snapshot import RepoSnapshot
+from app.audit_rules import AUDIT_RULES, run_audit
+from app.fast_path import answer_canonical
+from app.context_selector import select_context
+from app.response_cache import get_response_cache, response_key
+from app.json_stream import AnswerStream, loads_tolerant
+from app.query_router import Timings, classify, record
 load_dotenv(find_dotenv(), override=False)
 
-model = genai.GenerativeModel("gemini-1.5-flash")
-
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 GEMINI_API = os.getenv("GEMINI_API")
-owner = os.getenv("GITHUB_OWNER", "vulnerable-apps")
-repo = os.getenv("GITHUB_REPO", "juice-shop")
-
-genai.configure(api_key=GEMINI_API)
+GITHUB_OWNER = os.getenv("GITHUB_OWNER", "vulnerable-apps")
+GITHUB_REPO = os.getenv("GITHUB_REPO", "juice-shop")
 
-headers = {
-    "Authorization": f"token {GITHUB_TOKEN}",
-    "Accept": "application/vnd.github.v3+json"
-}
+# Created on first use by get_model() so importing this module stays cheap and offline
+model = None
 
-csv_file = r"backend\app\data.csv"
 
+def get_model():
+    global model
+    if model is None:
+        import google.generativeai as genai
+        genai.configure(api_key=GEMINI_API)
+        model = genai.GenerativeModel("gemini-1.5-flash")
+    return model
 
 def fetch_repo_data(owner, repo):
-    prs_url = f"https://api.github.com/repos/{owner}/{repo}/pulls?state=all&per_page=100"
-    prs = requests.get(prs_url, headers=headers).json()
-
-    for pr in prs:
-        if "url" in pr:  # Avoid errors on malformed data
-            reviews_url = pr["url"] + "/reviews"
-            pr["reviews"] = requests.get(reviews_url, headers=headers).json() if pr["state"] == "closed" else []
-    return prs
+    # Follows every page; reviews are fetched concurrently over the shared session
+    return list(iter_pulls_with_reviews(owner, repo))
 
 def generate_context_text(prs, reference_reviewer="Alice"):
-    now = datetime.datetime.utcnow()
-    context_parts = []
+    # prs may be any iterable (e.g. iter_pulls_with_reviews); it is read once into a
+    # PRTable and every registered audit rule (app/audit_rules.py) is evaluated over it.
     sep = "\n" + "-"*70 + "\n"
-
-    # 1. PRs merged without approval
-    merged_no_approval = []
-    for pr in prs:
-        if pr['merged_at']:
-            # If there are no reviews or none with 'APPROVED'
-            if not pr['reviews'] or not any(r['state'] == 'APPROVED' for r in pr['reviews']):
-                merged_no_approval.append({
-                    'id': pr['number'],
-                    'title': pr['title'],
-                    'merged_by': pr['merged_by']['login'] if pr.get('merged_by') else "Unknown",
-                    'reviews': []
-                })
-    context_parts.append(
-        f"PRs merged without approval: {len(merged_no_approval)}\n"
-        + "PR ID | Title | Merged By | Reviews\n"
-        + "\n".join([f"{pr['id']} | {pr['title']} | {pr['merged_by']} | {pr['reviews']}" for pr in merged_no_approval])
-    )
-
-    # 2. PRs reviewed by Alice
-    alice_reviews = []
-    for pr in prs:
-        for rev in pr['reviews']:
-            if rev['user']['login'].lower() == reference_reviewer.lower():
-                alice_reviews.append({
-                    'id': pr['number'],
-                    'title': pr['title'],
-                    'reviewer': rev['user']['login'],
-                    'decision': rev['state'],
-                    'date': rev['submitted_at']
-                })
-    context_parts.append(
-        f"PRs reviewed by {reference_reviewer}:\n"
-        + "PR ID | Title | Reviewer | Decision | Date\n"
-        + "\n".join([f"{pr['id']} | {pr['title']} | {pr['reviewer']} | {pr['decision']} | {pr['date']}" for pr in alice_reviews])
-    )
-
-    # 3. PRs waiting for review >24h
-    waiting_prs = []
-    for pr in prs:
-        if pr['state'] == 'open' and not pr.get('requested_reviewers'):  # No reviewers assigned
-            created_at = datetime.datetime.strptime(pr['created_at'], "%Y-%m-%dT%H:%M:%SZ")
-            waiting_time = (now - created_at).total_seconds() / 3600
-            if waiting_time > 24:
-                waiting_prs.append({
-                    'id': pr['number'],
-                    'title': pr['title'],
-                    'created_at': pr['created_at'],
-                    'review_requested': False,
-                    'waiting_hours': round(waiting_time, 1)
-                })
-    context_parts.append(
-        f"PRs waiting >24h for review:\n"
-        + "PR ID | Title | Created At | Review Requested | Waiting Hours\n"
-        + "\n".join([f"{pr['id']} | {pr['title']} | {pr['created_at']} | {pr['review_requested']} | {pr['waiting_hours']}" for pr in waiting_prs])
-    )
-
-    # 4. PRs merged in last 7 days and who approved
-    pr_last7 = []
-    week_ago = now - datetime.timedelta(days=7)
-    for pr in prs:
-        if pr['merged_at']:
-            merged_at = datetime.datetime.strptime(pr['merged_at'], "%Y-%m-%dT%H:%M:%SZ")
-            if merged_at > week_ago:
-                approvers = [rev['user']['login'] for rev in pr['reviews'] if rev['state'] == 'APPROVED']
-                pr_last7.append({
-                    'id': pr['number'],
-                    'title': pr['title'],
-                    'merged_at': pr['merged_at'],
-                    'approvers': approvers
-                })
-    context_parts.append(
-        "PRs merged in last 7 days:\n"
-        + "PR ID | Title | Merged At | Approvers\n"
-        + "\n".join([f"{pr['id']} | {pr['title']} | {pr['merged_at']} | {pr['approvers']}" for pr in pr_last7])
-    )
+    sections = run_audit(prs, reviewer=reference_reviewer)
 
     # Join all parts for use as LLM context
-    return sep.join(context_parts)
+    return sep.join(sections.values())
 
 # def generate_context_text(prs, reference_reviewer="Alice"):
 #     now = datetime.datetime.utcnow()
@@ -149,36 +78,68 @@ def generate_context_text(prs, reference_reviewer="Alice"):
 
 #     return sep.join(context_parts)
 
-def generate_full_context(owner, repo, reference_reviewer="Alice"):
-    context_parts = []
+def build_repo_context(owner, repo, reference_reviewer="Alice"):
+    """
+    Crawls the repo once and returns an immutable RepoSnapshot: metadata,
+    issues, the PRTable and every context section built from them.
+    """
+    built_at = time.time()
+    sections = {}
 
     # Repo metadata
-    repo_info = generate_repo_context(owner, repo)
-    context_parts.append(f"Repository: {repo_info['name']} ({repo_info['owner']})\n"
-                         f"Description: {repo_info['description']}\n"
-                         f"Stars: {repo_info['stars']}, Forks: {repo_info['forks']}\n"
-                         f"Default Branch: {repo_info['default_branch']}\n"
-                         f"License: {repo_info['license']}")
+    repo_info = RepoInfo.from_dict(generate_repo_context(owner, repo))
+    sections["repository"] = (f"Repository: {repo_info.name} ({repo_info.owner})\n"
+                              f"Description: {repo_info.description}\n"
+                              f"Stars: {repo_info.stars}, Forks: {repo_info.forks}\n"
+                              f"Default Branch: {repo_info.default_branch}\n"
+                              f"License: {repo_info.license}")
 
     # Branches
     branches = generate_branch_context(owner, repo)
-    context_parts.append("Branches:\n" + "\n".join([f"{b['name']} (commit: {b['commit'][:7]})" for b in branches]))
+    sections["branches"] = "Branches:\n" + "\n".join([f"{b['name']} (commit: {b['commit'][:7]})" for b in branches])
+
+    if SYNC_ENABLED:
+        # Pull only what changed since the last run, then read from the local store
+        sync_repo(owner, repo)
+        issues = list(iter_synced_issues(owner, repo))
+        prs = iter_synced_pulls(owner, repo)
+    else:
+        # Stream every page straight from GitHub
+        issues = list(iter_issue_context(owner, repo))
+        prs = iter_pull_context(owner, repo)
 
     # Issues
-    issues = generate_issue_context(owner, repo)
-    context_parts.append("Issues:\n" + "\n".join(
-        [f"{i['id']} | {i['title']} | {i['state']} | Assignee: {i['assignee']} | Labels: {i['labels']}" for i in issues]
-    ))
+    sections["issues"] = "Issues:\n" + "\n".join(
+        f"{i.id} | {i.title} | {i.state} | Assignee: {i.assignee} | Labels: {list(i.labels)}" for i in issues
+    )
+
+    # Pull Requests: one section per audit rule
+    from app.pr_table import PRTable  # pandas is only loaded once a context is built
+    table = PRTable.from_prs(prs)
+    sections.update(run_audit(table, reviewer=reference_reviewer))
+    return RepoSnapshot(owner, repo, repo_info, issues, table, sections, built_at)
+
+def generate_context_sections(owner, repo, reference_reviewer="Alice"):
+    return build_repo_context(owner, repo, reference_reviewer).sections
 
-    # Pull Requests (reuse your existing generate_context_text)
-    prs = fetch_repo_data(owner, repo)
-    context_parts.append(generate_context_text(prs, reference_reviewer))
+def join_context_sections(sections):
+    audit = [text for name, text in sections.items() if name in AUDIT_RULES]
+    parts = [text for name, text in sections.items() if name not in AUDIT_RULES]
+    if audit:
+        parts.append(("\n" + "-"*70 + "\n").join(audit))
+    return "\n\n" + ("-"*80 + "\n").join(parts)
 
-    return "\n\n" + ("-"*80 + "\n").join(context_parts)
+def generate_full_context(owner, repo, reference_reviewer="Alice"):
+    return join_context_sections(generate_context_sections(owner, repo, reference_reviewer))
+
+# Kept warm in the background (started from main.py) so queries never wait on GitHub
+snapshots = SnapshotScheduler(build_repo_context)
 
 def generate_repo_context(owner, repo):
-    repo_url = f"https://api.github.com/repos/{owner}/{repo}"
-    repo_data = requests.get(repo_url, headers=headers).json()
+    if DATA_SOURCE == "graphql":
+        return github_graphql.fetch_repo_context(owner, repo)
+    repo_url = f"{GITHUB_API_URL}/repos/{owner}/{repo}"
+    repo_data = get_json(repo_url)
     return {
         "name": repo_data.get("name"),
         "owner": repo_data.get("owner", {}).get("login"),
@@ -190,40 +151,60 @@ def generate_repo_context(owner, repo):
     }
 
 def generate_branch_context(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}/branches"
-    branches = requests.get(url, headers=headers).json()
+    if DATA_SOURCE == "graphql":
+        branches = github_graphql.iter_branches(owner, repo)
+    else:
+        url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/branches"
+        branches = iter_pages(url, {"per_page": PER_PAGE})
     return [{"name": b["name"], "protected": b["protected"], "commit": b["commit"]["sha"]} for b in branches]
 
-def generate_issue_context(owner, repo):
-    url = f"https://api.github.com/repos/{owner}/{repo}/issues?state=all&per_page=100"
-    issues = requests.get(url, headers=headers).json()
-    issue_summary = []
-    for i in issues:
+def summarize_issue(i):
+    return IssueRecord.from_github(i)
+
+def iter_pull_context(owner, repo):
+    if DATA_SOURCE == "graphql":
+        return github_graphql.iter_pulls_with_reviews(owner, repo)
+    return iter_pulls_with_reviews(owner, repo)
+
+def iter_issue_context(owner, repo):
+    source = github_graphql.iter_issues if DATA_SOURCE == "graphql" else iter_issues
+    for i in source(owner, repo):
         if "pull_request" not in i:  # exclude PRs
-            issue_summary.append({
-                "id": i["number"],
-                "title": i["title"],
-                "state": i["state"],
-                "assignee": i["assignee"]["login"] if i.get("assignee") else None,
-                "labels": [l["name"] for l in i["labels"]],
-                "created_at": i["created_at"]
-            })
-    return issue_summary
-
-def get_modified_prompt(query):
-    q_lower = query.lower()
-    if any(k in q_lower for k in ["pr ", "pull request", "merged", "review", "approv"]):
-        pr_query(query)
-    else:
-        ask_gemini_with_csv(query)
+            yield summarize_issue(i)
 
-query = "How many PRs have been waiting for review more than 24 hours?"
+def generate_issue_context(owner, repo):
+    return list(iter_issue_context(owner, repo))
+
+def get_modified_prompt(query, route=None, pr_info=None, csv_text=None):
+    """
+    The Gemini prompt for a routed query (app/query_router.py): PR data,
+    inventory rows, or both in one merged prompt for mixed questions.
+    """
+    route = route or classify(query)
+    if route == "inventory":
+        return inventory_prompt(query, csv_text)
+    if route == "mixed":
+        return mixed_prompt(query, pr_info, csv_text)
+    return pr_query(query, pr_info)
+
+def current_snapshot(owner=GITHUB_OWNER, repo=GITHUB_REPO):
+    return snapshots.get(owner, repo)
+
+def build_pr_context(query, snapshot=None):
+    # Only the sections/rows relevant to the query, within the prompt token budget
+    snapshot = snapshot or current_snapshot()
+    return join_context_sections(select_context(query, snapshot.sections))
+
+def fast_path_answer(query, snapshot=None):
+    """
+    Answers canonical audit questions straight from the snapshot's PRTable
+    (app/fast_path.py); None means the question needs the LLM.
+    """
+    return answer_canonical(query, (snapshot or current_snapshot()).table)
 
-def pr_query(query):
-    owner = "vulnerable-apps"
-    repo = "juice-shop"
-    context_text = generate_full_context(owner, repo)
-    pr_info = context_text[:]
+def pr_query(query, pr_info=None):
+    if pr_info is None:
+        pr_info = build_pr_context(query)
     combined_prompt = f"""
     You are an AI audit assistant. Please answer the following query with a JSON object with two keys:
 
@@ -244,17 +225,28 @@ def pr_query(query):
     """
     return combined_prompt
 
-def ask_gemini_with_csv(query,model=model, csv_path=csv_file):
-    # Read CSV file if provided
-    csv_text = ""
-    if csv_path:
-        df = pd.read_csv(csv_path)
-        csv_text = "CSV DATA:\n" + df.to_csv(index=False)
-
-    context = ""
-    if csv_text:
-        context += csv_text + "\n\n"
+def ask_gemini_with_csv(query, model=None, csv_path=None):
+    """
+    Answers an inventory question. Filter-only questions are answered from the
+    cached inventory frame (app/inventory.py); otherwise only the matching rows
+    are sent to Gemini. csv_path defaults to INVENTORY_CSV.
+    """
+    from app.inventory import get_inventory, inventory_context
+    direct, csv_text = inventory_context(query, get_inventory(csv_path))
+    if direct is not None:
+        return direct
+    cached = cached_answer(query, csv_text)
+    if cached is not None:
+        return cached
+
+    prompt = inventory_prompt(query, csv_text)
+    response = (model or get_model()).generate_content(prompt)
+    res_json = safe_json_loads(response.text)
+    store_answer(query, csv_text, res_json)
+    return res_json
 
+def inventory_prompt(query, csv_text):
+    context = csv_text + "\n\n"
     prompt = f"""
     You are a GitHub analysis assistant.
 
@@ -299,12 +291,33 @@ def ask_gemini_with_csv(query,model=model, csv_path=csv_file):
 
     Respond ONLY with JSON matching the example structure exactly (no markdown or extra text).
     """
+    return prompt
 
+def mixed_prompt(query, pr_info, csv_text):
+    prompt = f"""
+    You are an AI audit assistant with two data sources: the GitHub repository's PR audit data and the laptop inventory.
+    Please answer the following query, combining both sources where needed, with a JSON object with two keys:
 
-    response = model.generate_content(prompt)
-    return response.text
+    1. "description": a concise, human-readable summary of the answer.
+    2. "csv": an array of JSON objects, one per row of the answer, using the column names from the data
+       (e.g. "PR ID", "Title", "SerialNo", "Model", "Owner").
 
-query = "HP Laptop info purchased" 
+    Query: {query}
+
+    PR DATA:
+    {pr_info}
+
+    INVENTORY DATA:
+    {csv_text}
+
+    Respond ONLY with JSON in this shape (no markdown or extra text):
+
+    {{
+    "description": "...summary text...",
+    "csv": [{{"column": "value"}}]
+    }}
+    """
+    return prompt
 
 # modified_prompt = get_modified_prompt(query)
 # response = model.generate_content(modified_prompt)
@@ -316,31 +329,177 @@ query = "HP Laptop info purchased"
 # print(response.text)
 def safe_json_loads(raw_output: str):
     """
-    Cleans LLM/Gemini output and parses JSON safely.
+    Cleans LLM/Gemini output and parses JSON safely, repairing truncated or
+    slightly malformed output (see app/json_stream.py) instead of discarding it.
     """
-    # Remove leading/trailing whitespace
-    text = raw_output.strip()
-
-    # If the model wrapped JSON in code fences like ```json ... ```
-    text = re.sub(r"^```(?:json)?", "", text)
-    text = re.sub(r"```$", "", text)
-    text = text.strip()
-
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError as e:
-        print("❌ JSON decode failed:", e)
-        print("Raw text was:\n", text[:500])
-        return None
+    res_json = loads_tolerant(raw_output)
+    if res_json is None:
+        print("❌ JSON decode failed even after repair")
+        print("Raw text was:\n", raw_output[:500])
+    return res_json
     
-def run_query(user_query:str):
-    modified_prompt = pr_query(user_query)
-    response = model.generate_content(modified_prompt)
+def cached_answer(user_query, context):
+    # Same question over the same data -> reuse the earlier answer
+    cache = get_response_cache()
+    return cache.get(response_key(user_query, context)) if cache else None
+
+def store_answer(user_query, context, res_json):
+    cache = get_response_cache()
+    if cache and res_json is not None:
+        cache.put(response_key(user_query, context), res_json)
+
+class QueryPlan:
+    """
+    A routed query ready to answer: either `answer` is already known (fast
+    path, direct inventory answer or cache hit) or `prompt` goes to Gemini and
+    the reply is cached under `context` (the data fingerprint, see finish_plan).
+    """
+    __slots__ = ("route", "answer", "context", "prompt", "timings")
+
+    def __init__(self, route, answer, context, prompt, timings):
+        self.route = route
+        self.answer = answer
+        self.context = context
+        self.prompt = prompt
+        self.timings = timings
+
+def pr_part(user_query, snapshot, direct, timings):
+    # The only step that may wait on GitHub: a repo without a snapshot is crawled here
+    if snapshot is None:
+        with timings.stage("snapshot"):
+            snapshot = current_snapshot()
+    with timings.stage("pr_context"):
+        fast = fast_path_answer(user_query, snapshot) if direct else None
+        if fast is not None:
+            return fast, None, None
+        # Cached answers are keyed on the snapshot's data, not on the rendered
+        # context, whose now-relative columns change on every prefetch
+        return None, build_pr_context(user_query, snapshot), f"snapshot:{snapshot.fingerprint()}"
+
+def inventory_part(user_query, direct, timings):
+    from app.inventory import get_inventory, inventory_context
+    with timings.stage("inventory_context"):
+        direct_answer, csv_text = inventory_context(user_query, get_inventory(), direct=direct)
+        return direct_answer, csv_text, csv_text
+
+def context_sources(user_query, route, snapshot, timings):
+    """
+    {source: callable returning (ready answer or None, context text, cache
+    fingerprint of that context)} for the route. Inventory-only queries never touch the repo snapshot, and mixed
+    queries skip the direct answers so both sources reach one LLM call.
+    """
+    direct = route != "mixed"
+    sources = {}
+    if route != "inventory":
+        sources["pr"] = partial(pr_part, user_query, snapshot, direct, timings)
+    if route != "pr":
+        sources["inventory"] = partial(inventory_part, user_query, direct, timings)
+    return sources
+
+def finish_plan(user_query, route, parts, timings):
+    pr_ready, pr_info, pr_key = parts.get("pr", (None, None, None))
+    inventory_ready, csv_text, inventory_key = parts.get("inventory", (None, None, None))
+    ready = pr_ready if pr_ready is not None else inventory_ready
+    if ready is not None:
+        return QueryPlan(route, ready, None, None, timings)
+    context = "\n\n".join(key for key in (pr_key, inventory_key) if key)
+    cached = cached_answer(user_query, context)
+    if cached is not None:
+        return QueryPlan(route, cached, context, None, timings)
+    return QueryPlan(route, None, context, get_modified_prompt(user_query, route, pr_info, csv_text), timings)
+
+def plan_query(user_query, snapshot=None):
+    timings = Timings()
+    route = classify(user_query)
+    sources = context_sources(user_query, route, snapshot, timings)
+    with timings.stage("contexts"):
+        if len(sources) == 1:
+            parts = {name: build() for name, build in sources.items()}
+        else:
+            # Mixed: both contexts are built at the same time
+            with ThreadPoolExecutor(len(sources), thread_name_prefix="query-context") as pool:
+                futures = {name: pool.submit(build) for name, build in sources.items()}
+                parts = {name: future.result() for name, future in futures.items()}
+    return finish_plan(user_query, route, parts, timings)
+
+async def plan_query_async(user_query):
+    timings = Timings()
+    route = classify(user_query)
+    sources = context_sources(user_query, route, None, timings)
+    with timings.stage("contexts"):
+        results = await asyncio.gather(*(asyncio.to_thread(build) for build in sources.values()))
+    return finish_plan(user_query, route, dict(zip(sources, results)), timings)
+
+def answered(plan):
+    plan.timings.done()
+    record(plan.route, plan.timings)
+    return plan.answer
+
+def run_query(user_query:str, snapshot=None):
+    # One snapshot for the whole answer (and the PDF, when called from a report job)
+    plan = plan_query(user_query, snapshot)
+    if plan.answer is not None:
+        return answered(plan)
+
+    with plan.timings.stage("llm"):
+        response = get_model().generate_content(plan.prompt)
     print(type(response.text))
     print(response.text)
     res = response.text
     res_json = safe_json_loads(res)
     print(type(res_json))
-    return res_json
+    store_answer(user_query, plan.context, res_json)
+    plan.answer = res_json
+    return answered(plan)
 
-print(run_query(query))
+async def run_query_async(user_query:str):
+    """
+    run_query for the event loop: context building (which may crawl GitHub on a
+    cold snapshot) runs in worker threads, both sources at once for mixed
+    queries, and Gemini is called via its async API.
+    """
+    plan = await plan_query_async(user_query)
+    if plan.answer is not None:
+        return answered(plan)
+
+    with plan.timings.stage("llm"):
+        response = await get_model().generate_content_async(plan.prompt)
+    res_json = safe_json_loads(response.text)
+    store_answer(user_query, plan.context, res_json)
+    plan.answer = res_json
+    return answered(plan)
+
+async def stream_query(user_query:str):
+    """
+    Async generator behind /query/stream. Yields ("token", text) for each piece
+    of the description and ("row", obj) for each completed csv row as Gemini
+    produces them, then ("result", parsed JSON).
+    """
+    plan = await plan_query_async(user_query)
+    ready = plan.answer
+    if ready is not None:
+        answered(plan)
+        yield "token", ready.get("description", "")
+        rows = ready.get("csv")
+        for row in rows if isinstance(rows, list) else []:
+            yield "row", row
+        yield "result", ready
+        return
+
+    answer = AnswerStream()
+    with plan.timings.stage("llm"):
+        response = await get_model().generate_content_async(plan.prompt, stream=True)
+        async for chunk in response:
+            text, rows = answer.feed(chunk.text)
+            if text:
+                yield "token", text
+            for row in rows:
+                yield "row", row
+
+    res_json = safe_json_loads(answer.buffer)
+    store_answer(user_query, plan.context, res_json)
+    plan.answer = res_json
+    yield "result", answered(plan)
+
+if __name__ == "__main__":
+    print(run_query("How many PRs have been waiting for review more than 24 hours?"))
@@ -0,0 +1,192 @@
+# github_graphql.py
+"""
+GraphQL-backed alternative to the REST fetchers (GITHUB_DATA_SOURCE=graphql).
+
+PRs come back with their reviews, requested reviewers and merged_by nested in
+the same page, so a repo costs a handful of paginated queries instead of
+1 + one request per PR. Every function returns the same shapes as its REST
+counterpart (dicts, or PullRecords for pulls) so the context builders don't
+care which source was used.
+"""
+import threading
+
+from app.github_client import GITHUB_API_URL, GitHubAPIError, iter_reviews, post_graphql
+from app.records import PullRecord, ReviewRecord, intern_login
+
+PULLS_PER_PAGE = 50  # each PR carries up to 100 reviews, keep pages well under the node limit
+
+RATE_LIMIT_FIELDS = "rateLimit { cost remaining resetAt }"
+
+REPO_QUERY = """
+query RepoInfo($owner: String!, $repo: String!) {
+  repository(owner: $owner, name: $repo) {
+    name
+    owner { login }
+    description
+    stargazerCount
+    forkCount
+    defaultBranchRef { name }
+    licenseInfo { spdxId }
+  }
+  %s
+}
+""" % RATE_LIMIT_FIELDS
+
+BRANCHES_QUERY = """
+query RepoBranches($owner: String!, $repo: String!, $after: String) {
+  repository(owner: $owner, name: $repo) {
+    page: refs(refPrefix: "refs/heads/", first: 100, after: $after) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name target { oid } branchProtectionRule { id } }
+    }
+  }
+  %s
+}
+""" % RATE_LIMIT_FIELDS
+
+ISSUES_QUERY = """
+query RepoIssues($owner: String!, $repo: String!, $after: String, $since: DateTime, $orderField: IssueOrderField!) {
+  repository(owner: $owner, name: $repo) {
+    page: issues(first: 100, after: $after, filterBy: {since: $since}, orderBy: {field: $orderField, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title state createdAt updatedAt
+        assignees(first: 1) { nodes { login } }
+        labels(first: 20) { nodes { name } }
+      }
+    }
+  }
+  %s
+}
+""" % RATE_LIMIT_FIELDS
+
+PULLS_QUERY = """
+query RepoPulls($owner: String!, $repo: String!, $after: String, $orderField: IssueOrderField!) {
+  repository(owner: $owner, name: $repo) {
+    page: pullRequests(first: %d, after: $after, orderBy: {field: $orderField, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes {
+        number title state createdAt updatedAt mergedAt
+        author { login }
+        mergedBy { login }
+        reviewRequests(first: 20) { nodes { requestedReviewer { ... on User { login } } } }
+        reviews(first: 100) { pageInfo { hasNextPage } nodes { author { login } state submittedAt } }
+      }
+    }
+  }
+  %s
+}
+""" % (PULLS_PER_PAGE, RATE_LIMIT_FIELDS)
+
+# Requests made and GraphQL rate-limit points spent, plus the last reported quota
+metrics = {"requests": 0, "cost": 0, "remaining": None, "reset_at": None}
+_metrics_lock = threading.Lock()
+
+
+def run_query(query, variables):
+    payload = post_graphql(query, variables)
+    limit = (payload.get("data") or {}).get("rateLimit")
+    with _metrics_lock:
+        metrics["requests"] += 1
+        if limit:
+            metrics["cost"] += limit["cost"]
+            metrics["remaining"] = limit["remaining"]
+            metrics["reset_at"] = limit["resetAt"]
+    if payload.get("errors"):
+        message = payload["errors"][0].get("message")
+        if not (payload.get("data") or {}).get("repository"):
+            raise GitHubAPIError(payload["errors"][0].get("type", "GRAPHQL"), variables.get("repo"), message)
+        print("❌ GitHub GraphQL query partially failed:", message)
+    return payload.get("data") or {}
+
+
+def iter_nodes(query, variables):
+    """
+    Follows the `page` connection's endCursor until the last page.
+    """
+    after = None
+    while True:
+        data = run_query(query, {**variables, "after": after})
+        page = (data.get("repository") or {}).get("page")
+        if not page:
+            return
+        yield from page["nodes"]
+        if not page["pageInfo"]["hasNextPage"]:
+            return
+        after = page["pageInfo"]["endCursor"]
+
+
+def _login(actor):
+    # Deleted accounts come back as null authors
+    return intern_login(actor["login"]) if actor else "ghost"
+
+
+def fetch_repo_context(owner, repo):
+    r = run_query(REPO_QUERY, {"owner": owner, "repo": repo}).get("repository") or {}
+    return {
+        "name": r.get("name"),
+        "owner": (r.get("owner") or {}).get("login"),
+        "description": r.get("description"),
+        "stars": r.get("stargazerCount"),
+        "forks": r.get("forkCount"),
+        "default_branch": (r.get("defaultBranchRef") or {}).get("name"),
+        "license": (r.get("licenseInfo") or {}).get("spdxId"),
+    }
+
+
+def iter_branches(owner, repo):
+    for b in iter_nodes(BRANCHES_QUERY, {"owner": owner, "repo": repo}):
+        yield {"name": b["name"], "protected": b["branchProtectionRule"] is not None, "commit": {"sha": b["target"]["oid"]}}
+
+
+def iter_issues(owner, repo, since=None, order_by="CREATED_AT"):
+    """
+    Issues in REST shape (no PRs: GraphQL keeps them separate).
+    """
+    variables = {"owner": owner, "repo": repo, "since": since, "orderField": order_by}
+    for i in iter_nodes(ISSUES_QUERY, variables):
+        assignees = i["assignees"]["nodes"]
+        yield {
+            "number": i["number"],
+            "title": i["title"],
+            "state": i["state"].lower(),
+            "assignee": {"login": assignees[0]["login"]} if assignees else None,
+            "labels": [{"name": l["name"]} for l in i["labels"]["nodes"]],
+            "created_at": i["createdAt"],
+            "updated_at": i["updatedAt"],
+        }
+
+
+def to_pull_record(owner, repo, node):
+    url = f"{GITHUB_API_URL}/repos/{owner}/{repo}/pulls/{node['number']}"
+    state = "open" if node["state"] == "OPEN" else "closed"
+    reviews = ()
+    # Same rule as the REST fetcher: only closed PRs carry reviews
+    if state == "closed":
+        if node["reviews"]["pageInfo"]["hasNextPage"]:
+            reviews = tuple(iter_reviews(url))  # rare: more than 100 reviews
+        else:
+            reviews = tuple(ReviewRecord(_login(r["author"]), r["state"], r["submittedAt"])
+                            for r in node["reviews"]["nodes"])
+    return PullRecord(
+        url,
+        node["number"],
+        node["title"],
+        state,
+        node["createdAt"],
+        node["updatedAt"],
+        node["mergedAt"],
+        _login(node["mergedBy"]) if node["mergedBy"] else None,
+        tuple(
+            intern_login(r["requestedReviewer"]["login"])
+            for r in node["reviewRequests"]["nodes"]
+            if r["requestedReviewer"] and "login" in r["requestedReviewer"]
+        ),
+        reviews,
+    )
+
+
+def iter_pulls_with_reviews(owner, repo, order_by="CREATED_AT"):
+    variables = {"owner": owner, "repo": repo, "orderField": order_by}
+    for node in iter_nodes(PULLS_QUERY, variables):
+        yield to_pull_record(owner, repo, node)
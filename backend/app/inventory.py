@@ -0,0 +1,303 @@
+# inventory.py
+"""
+Laptop inventory (SerialNo, Model, Owner, Status, PurchaseDate) behind the
+non-GitHub questions. The CSV is parsed once into a typed frame and reloaded
+only when the file changes; questions are turned into vectorized filters so
+simple lookups never reach Gemini and everything else sends only the
+matching rows.
+"""
+import datetime
+import os
+import re
+import threading
+
+from dotenv import load_dotenv, find_dotenv
+load_dotenv(find_dotenv(), override=False)
+
+INVENTORY_CSV = os.getenv("INVENTORY_CSV", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data.csv"))
+COLUMNS = ["SerialNo", "Model", "Owner", "Status", "PurchaseDate"]
+# Spreadsheet placeholders for "no owner"
+UNASSIGNED = ("", "-", "–", "—", "none", "n/a", "null")
+
+# Questions asking for more than a filtered listing go to the LLM
+FREE_FORM_HINTS = ("why", "explain", "summar", "compare", "trend", "recommend", "should", "average", "oldest",
+                   "newest", "most", "least", "replace", "upgrade")
+LIST_HINTS = ("which", "list", "show", "find", "give", "what", "who", "how many", "count", "number of")
+STATUS_WORDS = {"active": "Active", "in use": "Active", "assigned": "Active", "instore": "InStore",
+                "in store": "InStore", "in-store": "InStore", "spare": "InStore", "unassigned": "InStore",
+                "available": "InStore"}
+
+_DATE = r"(\d{4}-\d{2}-\d{2}|\d{4})"
+DATE_PATTERNS = (
+    ("between", re.compile(rf"\bbetween\s+{_DATE}\s+and\s+{_DATE}")),
+    ("from", re.compile(rf"\bfrom\s+{_DATE}\s+(?:to|until|till)\s+{_DATE}")),
+    ("before", re.compile(rf"\b(?:before|prior to|earlier than|until)\s+{_DATE}")),
+    ("after", re.compile(rf"\b(?:after|since|later than|from)\s+{_DATE}")),
+    ("in", re.compile(rf"\b(?:in|during|of)\s+{_DATE}\b")),
+)
+# "not active", "except Dell", "non-Dell", "not owned by Ravi": the filter that follows is inverted
+_NEGATION = re.compile(r"\b(?:not|except|excluding|without|other\s+than|non)\b|n't\b")
+_NEGATED_GAP = re.compile(r"[\s-]*(?:[\w-]+\s+){0,2}")
+
+metrics = {"loads": 0, "queries": 0, "answered_directly": 0, "rows_total": 0, "rows_sent": 0}
+_metrics_lock = threading.Lock()
+
+
+def _count(**deltas):
+    with _metrics_lock:
+        for name, delta in deltas.items():
+            metrics[name] += delta
+
+
+class Inventory:
+    """
+    The inventory as a typed frame indexed by SerialNo: Model and Status are
+    categoricals, Owner is None when unassigned and PurchaseDate is a
+    datetime64 column, so filters are plain vectorized comparisons.
+    """
+
+    def __init__(self, frame, path=None, mtime=None):
+        self.frame = frame
+        self.path = path
+        self.mtime = mtime
+        # Lower-cased lookups for matching names mentioned in a question
+        self.models = {m.lower(): m for m in frame["Model"].cat.categories}
+        self.brands = {m.split()[0].lower() for m in self.models}
+        self.owners = {o.lower(): o for o in frame["Owner"].dropna().unique()}
+        self.serials = {serial.lower(): serial for serial in frame.index}
+
+    @classmethod
+    def load(cls, path):
+        import pandas as pd  # only loaded once an inventory question comes in
+        mtime = os.stat(path).st_mtime_ns
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, usecols=COLUMNS)
+        df = df.apply(lambda column: column.str.strip())
+        owner = df["Owner"].astype(object).where(~df["Owner"].str.lower().isin(UNASSIGNED), None)
+        # .to_numpy(): the columns are positional, not aligned on the new SerialNo index
+        frame = pd.DataFrame({
+            "Model": pd.Categorical(df["Model"]),
+            "Owner": owner.to_numpy(dtype=object),
+            "Status": pd.Categorical(df["Status"]),
+            "PurchaseDate": pd.to_datetime(df["PurchaseDate"], errors="coerce").to_numpy(),
+        }, index=pd.Index(df["SerialNo"], name="SerialNo"))
+        _count(loads=1)
+        return cls(frame.sort_values("PurchaseDate", ascending=False, kind="stable"), path, mtime)
+
+    def __len__(self):
+        return len(self.frame)
+
+    def select(self, filters):
+        """Rows matching every filter (see parse_filters), newest purchase first."""
+        df = self.frame
+        tests = {
+            "serial": lambda values: df.index.isin(values),
+            "status": lambda values: df["Status"].isin(values),
+            "model": lambda values: df["Model"].isin(values),
+            "owner": lambda values: df["Owner"].isin(values),
+            "after": lambda day: df["PurchaseDate"] >= day,
+            "before": lambda day: df["PurchaseDate"] < day,
+        }
+        # not_<name>: rows the filter would not match ("not_dates" holds the after/before bounds)
+        for name in ("serial", "status", "model", "owner"):
+            tests["not_" + name] = lambda values, test=tests[name]: ~test(values)
+        tests["not_dates"] = lambda bounds: ~_in_range(df["PurchaseDate"], bounds)
+        mask = None
+        for name, value in filters.items():
+            match = tests[name](value)
+            mask = match if mask is None else mask & match
+        return df if mask is None else df[mask]
+
+    def parse_filters(self, query):
+        """
+        Status, model/brand, owner and purchase-date filters named in the
+        question. Values are the frame's own spellings; dates are
+        [after, before) bounds. A filter preceded by a negation ("not
+        active", "except Dell") is stored inverted, as not_<name>.
+        """
+        q = query.lower()
+        terms = []  # (start, filter name, value) for every filter term in the question
+
+        for m in re.finditer(r"\b[a-z]+\d+\b", q):
+            if m.group() in self.serials:
+                terms.append((m.start(), "serial", self.serials[m.group()]))
+
+        for word, status in STATUS_WORDS.items():
+            terms += [(m.start(), "status", status) for m in re.finditer(rf"\b{word}\b", q)]
+
+        models = [(q.find(name), m) for name, m in self.models.items() if name in q]
+        if not models:
+            for brand in self.brands:
+                for m in re.finditer(rf"\b{re.escape(brand)}\b", q):
+                    models += [(m.start(), model) for name, model in self.models.items() if name.split()[0] == brand]
+        terms += [(start, "model", model) for start, model in models]
+
+        for name, owner in self.owners.items():
+            terms += [(m.start(), "owner", owner) for m in re.finditer(rf"\b{re.escape(name)}\b", q)]
+
+        dates, date_start = parse_dates(q, with_start=True)
+        if dates:
+            terms.append((date_start, "dates", None))
+
+        # A negation inverts only the first term after it, at most two words on
+        negated = set()
+        for m in _NEGATION.finditer(q):
+            following = [start for start, _, _ in terms if start >= m.end()]
+            if following and _NEGATED_GAP.fullmatch(q, m.end(), min(following)):
+                negated.add(min(following))
+
+        found = {}
+        for start, name, value in terms:
+            if name != "dates":
+                found.setdefault(("not_" if start in negated else "") + name, set()).add(value)
+        filters = {name: sorted(values) for name, values in found.items()}
+        if dates and date_start in negated:
+            filters["not_dates"] = (dates.get("after"), dates.get("before"))
+        else:
+            filters.update(dates)
+        return filters
+
+    def to_rows(self, df):
+        """Answer rows in the {description, csv} schema (Owner null when unassigned)."""
+        # Column lists zipped into dicts: several times faster than DataFrame.to_dict("records")
+        dates = df["PurchaseDate"].dt.strftime("%Y-%m-%d")
+        columns = [
+            df.index.tolist(),
+            df["Model"].tolist(),
+            _nulls(df["Owner"]),
+            df["Status"].tolist(),
+            _nulls(dates),
+        ]
+        return [dict(zip(COLUMNS, row)) for row in zip(*columns)]
+
+    def to_csv(self, df):
+        """The matching rows as prompt context."""
+        out = df.reset_index()
+        out["PurchaseDate"] = out["PurchaseDate"].dt.strftime("%Y-%m-%d")
+        return out.to_csv(index=False)
+
+
+def _nulls(column):
+    # Missing values as None (JSON null) rather than NaN
+    return column.astype(object).where(column.notna(), None).tolist()
+
+
+def _bound(value, end=False):
+    # A bare year covers the whole year: "before 2024" -> < 2024-01-01, "in 2024" -> [2024-01-01, 2025-01-01)
+    if len(value) == 4:
+        return datetime.datetime(int(value) + (1 if end else 0), 1, 1)
+    day = datetime.datetime.strptime(value, "%Y-%m-%d")
+    return day + datetime.timedelta(days=1) if end else day
+
+
+def parse_dates(q, with_start=False):
+    """
+    {"after": ..., "before": ...} bounds named in the question; with_start,
+    also where the matching phrase starts (for negation, see parse_filters).
+    """
+    bounds, start = {}, None
+    for kind, pattern in DATE_PATTERNS:
+        m = pattern.search(q)
+        if not m:
+            continue
+        start = m.start()
+        if kind in ("between", "from"):
+            bounds = {"after": _bound(m.group(1)), "before": _bound(m.group(2), end=True)}
+        elif kind == "before":
+            bounds = {"before": _bound(m.group(1))}
+        elif kind == "after":
+            # "since 2024-03-01" includes that day; "after 2024" starts with 2025
+            inclusive = q[m.start():].startswith(("since", "from"))
+            bounds = {"after": _bound(m.group(1)) if inclusive else _bound(m.group(1), end=True)}
+        else:
+            bounds = {"after": _bound(m.group(1)), "before": _bound(m.group(1), end=True)}
+        break
+    return (bounds, start) if with_start else bounds
+
+
+def _in_range(dates, bounds):
+    after, before = bounds
+    mask = dates.notna()
+    if after is not None:
+        mask &= dates >= after
+    if before is not None:
+        mask &= dates < before
+    return mask
+
+
+def describe_filters(filters):
+    parts = []
+    for name in ("serial", "status", "model", "owner"):
+        for prefix in ("", "not_"):
+            if prefix + name in filters:
+                values = "/".join(filters[prefix + name])
+                values = "owned by " + values if name == "owner" else values
+                parts.append(("not " if prefix else "") + values)
+    if "after" in filters:
+        parts.append(f"purchased on or after {filters['after']:%Y-%m-%d}")
+    if "before" in filters:
+        parts.append(f"purchased before {filters['before']:%Y-%m-%d}")
+    if "not_dates" in filters:
+        after, before = filters["not_dates"]
+        bounds = [f"on or after {after:%Y-%m-%d}" if after else "", f"before {before:%Y-%m-%d}" if before else ""]
+        parts.append("not purchased " + " and ".join(b for b in bounds if b))
+    return ", ".join(parts)
+
+
+def answer_inventory(query, inventory, filters=None):
+    """
+    Answers "which/list/how many <filters>" questions straight from the frame.
+    None means the question needs the LLM.
+    """
+    q = query.lower()
+    filters = inventory.parse_filters(query) if filters is None else filters
+    if not filters or any(hint in q for hint in FREE_FORM_HINTS) or not any(hint in q for hint in LIST_HINTS):
+        return None
+    # A negation that inverted no filter ("laptops without a charger") is for the LLM
+    if _NEGATION.search(q) and not any(name.startswith("not_") for name in filters):
+        return None
+    rows = inventory.to_rows(inventory.select(filters))
+    noun = "laptop" if len(rows) == 1 else "laptops"
+    description = f"{len(rows)} {noun} matched: {describe_filters(filters)}."
+    return {"description": description, "csv": rows}
+
+
+_inventory = None
+_inventory_lock = threading.Lock()
+
+
+def get_inventory(path=None):
+    """
+    The parsed inventory, re-read only when the CSV's mtime changes (one
+    stat() per question instead of a full parse).
+    """
+    global _inventory
+    path = path or INVENTORY_CSV
+    mtime = os.stat(path).st_mtime_ns
+    current = _inventory
+    if current is not None and current.path == path and current.mtime == mtime:
+        return current
+    with _inventory_lock:
+        if _inventory is None or _inventory.path != path or _inventory.mtime != mtime:
+            _inventory = Inventory.load(path)
+        return _inventory
+
+
+def inventory_context(query, inventory=None, direct=True):
+    """
+    (direct answer or None, prompt context). The context holds only the rows
+    matching the question's filters, or every row when it names none.
+    direct=False always returns the context (e.g. for a mixed PR + inventory
+    question answered in one LLM call).
+    """
+    inventory = inventory or get_inventory()
+    filters = inventory.parse_filters(query)
+    _count(queries=1, rows_total=len(inventory))
+    answer = answer_inventory(query, inventory, filters) if direct else None
+    if answer is not None:
+        _count(answered_directly=1)
+        return answer, None
+    matched = inventory.select(filters)
+    _count(rows_sent=len(matched))
+    header = f"CSV DATA ({len(matched)} of {len(inventory)} rows"
+    header += f"; {describe_filters(filters)}):\n" if filters else "):\n"
+    return None, header + inventory.to_csv(matched)
@@ -0,0 +1,242 @@
+# json_stream.py
+import json
+import re
+
+_FENCE_START = re.compile(r"^```(?:json)?")
+_FENCE_END = re.compile(r"```$")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_DESCRIPTION_START = re.compile(r'(?<!\\)"description"\s*:\s*"')
+_CSV_START = re.compile(r'(?<!\\)"csv"\s*:\s*\[')
+_CLOSERS = {"{": "}", "[": "]"}
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+
+
+def _hex4(text):
+    # The code point of a \uXXXX escape's digits, or None if they aren't four hex digits
+    return int(text, 16) if _HEX4.fullmatch(text) else None
+
+
+class DescriptionStream:
+    """
+    Pulls the "description" string out of a {description, csv} JSON answer
+    while it is still being generated. feed() takes the next chunk of model
+    output and returns the newly completed description text (possibly "").
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = None  # index of the next unread description character
+        self.done = False
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        if self.done:
+            return ""
+        if self.pos is None:
+            match = _DESCRIPTION_START.search(self.buffer)
+            if not match:
+                return ""
+            self.pos = match.end()
+
+        out = []
+        buf, i = self.buffer, self.pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self.done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # Escape sequence: wait until it is complete
+            if i + 1 >= len(buf):
+                break
+            code = buf[i + 1]
+            if code == "u":
+                if i + 6 > len(buf):
+                    break
+                code_point = _hex4(buf[i + 2:i + 6])
+                if code_point is None:
+                    # Malformed escape from the model: pass the raw characters through
+                    out.append(buf[i:i + 2])
+                    i += 2
+                    continue
+                if 0xD800 <= code_point < 0xE000:  # surrogate pair: needs the low half too
+                    if code_point < 0xDC00 and i + 12 > len(buf):
+                        break
+                    low = _hex4(buf[i + 8:i + 12]) if code_point < 0xDC00 and buf[i + 6:i + 8] == "\\u" else None
+                    if low is None or not 0xDC00 <= low < 0xE000:
+                        # Lone surrogate: not encodable, replace it
+                        out.append("\ufffd")
+                        i += 6
+                        continue
+                    code_point = 0x10000 + ((code_point - 0xD800) << 10) + (low - 0xDC00)
+                    i += 6
+                out.append(chr(code_point))
+                i += 6
+            else:
+                out.append(_ESCAPES.get(code, code))
+                i += 2
+        self.pos = i
+        return "".join(out)
+
+
+class RowStream:
+    """
+    Emits each object of the answer's "csv" array as soon as its closing
+    brace arrives. feed() returns the list of newly completed rows.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.pos = None
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.row_start = None
+        self.done = False
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        if self.done:
+            return []
+        if self.pos is None:
+            match = _CSV_START.search(self.buffer)
+            if not match:
+                return []
+            self.pos = match.end()
+
+        rows = []
+        buf = self.buffer
+        for i in range(self.pos, len(buf)):
+            ch = buf[i]
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == "\\":
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+            elif ch == '"':
+                self.in_string = True
+            elif ch in "{[":
+                if self.depth == 0 and ch == "{":
+                    self.row_start = i
+                self.depth += 1
+            elif ch in "}]":
+                if self.depth == 0:  # end of the csv array
+                    self.done = True
+                    break
+                self.depth -= 1
+                if self.depth == 0 and self.row_start is not None:
+                    row = loads_tolerant(buf[self.row_start:i + 1])
+                    if row is not None:
+                        rows.append(row)
+                    self.row_start = None
+        self.pos = len(buf)
+        return rows
+
+
+class AnswerStream:
+    """
+    Incremental parser for the {"description", "csv"} answer schema:
+    feed() returns (new description text, newly completed csv rows) and
+    result() parses the whole output, repairing it if it was cut short.
+    """
+
+    def __init__(self):
+        self.description = DescriptionStream()
+        self.rows = RowStream()
+        self.buffer = ""
+
+    def feed(self, chunk):
+        self.buffer += chunk
+        return self.description.feed(chunk), self.rows.feed(chunk)
+
+    def result(self):
+        return loads_tolerant(self.buffer)
+
+
+def strip_fences(text):
+    # If the model wrapped JSON in code fences like ```json ... ```
+    text = _FENCE_START.sub("", text.strip())
+    text = _FENCE_END.sub("", text)
+    return text.strip()
+
+
+def _close(text, stack):
+    return text + "".join(_CLOSERS[opener] for opener in reversed(stack))
+
+
+def repair_json(text):
+    """
+    Best-effort fix-up of model JSON: drops prose around the first object,
+    trailing commas, and closes whatever strings, arrays and objects were left
+    open by a truncated generation (cutting back to the last complete element
+    if needed). Returns the repaired text, which may still be invalid.
+    """
+    start = text.find("{")
+    if start == -1:
+        return text
+    text = text[start:]
+
+    stack, commas = [], []
+    in_string = escape = False
+    for i, ch in enumerate(text):
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append(ch)
+        elif ch in "}]":
+            if stack:
+                stack.pop()
+            if not stack:
+                return _TRAILING_COMMA.sub(r"\1", text[:i + 1])
+        elif ch == ",":
+            commas.append((i, tuple(stack)))
+
+    # Truncated: first try to keep everything, then cut back to earlier commas
+    tail = text[:-1] if escape else text
+    if in_string:
+        tail += '"'
+    tail = tail.rstrip()
+    if tail.endswith(","):
+        tail = tail[:-1]
+    elif tail.endswith(":"):
+        tail += " null"
+    candidates = [_close(tail, stack)]
+    candidates += [_close(text[:i], list(st)) for i, st in reversed(commas[-3:])]
+    for candidate in candidates:
+        candidate = _TRAILING_COMMA.sub(r"\1", candidate)
+        try:
+            json.loads(candidate)
+            return candidate
+        except json.JSONDecodeError:
+            continue
+    return candidates[0]
+
+
+def loads_tolerant(raw_output):
+    """
+    json.loads for model output; falls back to repair_json. None if unparseable.
+    """
+    text = strip_fences(raw_output)
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    try:
+        return json.loads(repair_json(text))
+    except json.JSONDecodeError:
+        return None
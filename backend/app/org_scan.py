@@ -0,0 +1,115 @@
+# org_scan.py
+import os
+import time
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from dotenv import load_dotenv, find_dotenv
+from app.github_client import GITHUB_API_URL, PER_PAGE, iter_pages, iter_pulls_with_reviews, quota_wait_seconds, rate_limit
+from app.audit_rules import Section, evaluate_rules
+load_dotenv(find_dotenv(), override=False)
+
+# Repos audited at the same time; their HTTP calls share the global request cap in github_client
+ORG_SCAN_REPOS_IN_FLIGHT = int(os.getenv("ORG_SCAN_REPOS_IN_FLIGHT", "4"))
+# Don't start another repo while fewer than this many GitHub requests remain
+ORG_SCAN_RATE_LIMIT_FLOOR = int(os.getenv("ORG_SCAN_RATE_LIMIT_FLOOR", "200"))
+
+
+def iter_org_repos(org, include_archived=False):
+    url = f"{GITHUB_API_URL}/orgs/{org}/repos"
+    for r in iter_pages(url, {"type": "all", "per_page": PER_PAGE}):
+        if include_archived or not r.get("archived"):
+            yield r["owner"]["login"], r["name"]
+
+
+class ScanCancelled(Exception):
+    pass
+
+
+def _until_cancelled(prs, cancel):
+    for pr in prs:
+        if cancel is not None and cancel.is_set():
+            raise ScanCancelled("org scan cancelled")
+        yield pr
+
+
+def audit_repo(owner, repo, params, cancel=None):
+    # The repo's PRTable only lives for the duration of this call; a cancelled scan stops crawling it
+    return evaluate_rules(_until_cancelled(iter_pulls_with_reviews(owner, repo), cancel), **params)
+
+
+def iter_repo_audits(repos, max_in_flight=ORG_SCAN_REPOS_IN_FLIGHT, cancel=None, **params):
+    """
+    Audits (owner, repo) pairs in parallel and yields (owner, repo, sections,
+    error) as each finishes: sections is None and error the exception when
+    that repo's audit raised. At most `max_in_flight` repos are held in memory at once,
+    and new repos wait while the GitHub quota is below the floor.
+
+    Setting the `cancel` event (a threading.Event) stops the scan: no new
+    repo is started and running audits stop between PRs.
+    """
+    repos = iter(repos)
+    with ThreadPoolExecutor(max_workers=max_in_flight) as pool:
+        pending = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(pending) < max_in_flight:
+                delay = quota_wait_seconds(ORG_SCAN_RATE_LIMIT_FLOOR)
+                if delay:
+                    print(f"⏳ GitHub quota low ({rate_limit['remaining']} left), org scan waiting {delay:.0f}s")
+                    if cancel is not None:
+                        cancel.wait(delay)
+                    else:
+                        time.sleep(delay)
+                if cancel is not None and cancel.is_set():
+                    exhausted = True
+                    break
+                nxt = next(repos, None)
+                if nxt is None:
+                    exhausted = True
+                    break
+                pending[pool.submit(audit_repo, *nxt, params, cancel)] = nxt
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                owner, repo = pending.pop(future)
+                try:
+                    sections = future.result()
+                except ScanCancelled:
+                    continue
+                except Exception as e:
+                    print(f"❌ Audit failed for {owner}/{repo}:", e)
+                    yield owner, repo, None, e
+                else:
+                    yield owner, repo, sections, None
+
+
+def scan_org(org, rules=None, max_repos=None, max_in_flight=ORG_SCAN_REPOS_IN_FLIGHT, cancel=None, **params):
+    """
+    Audits every repository in `org` and merges each audit section across
+    repos (rows gain a leading Repo column). Repos are consumed as a stream,
+    so only the findings are kept, never a repo's full PR list. Repos whose
+    audit failed are listed under "failed" rather than counted as scanned.
+    Only the first `max_repos` repos are audited when it is set; `cancel`
+    stops the scan early (see iter_repo_audits).
+    """
+    merged = {}
+    scanned = 0
+    failed = []
+    repos = islice(iter_org_repos(org), max_repos)
+    for owner, repo, sections, error in iter_repo_audits(repos, max_in_flight, cancel, rules=rules, **params):
+        if error is not None:
+            failed.append({"repo": f"{owner}/{repo}", "error": str(error)})
+            continue
+        scanned += 1
+        for name, section in sections.items():
+            if name not in merged:
+                merged[name] = Section(section.title, ["Repo"] + section.columns, [])
+            merged[name].rows.extend([f"{owner}/{repo}", *row] for row in section.rows)
+    return {
+        "org": org,
+        "repos_scanned": scanned,
+        "failed": failed,
+        "sections": {name: section.format() for name, section in merged.items()},
+    }
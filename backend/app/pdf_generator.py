@@ -1,13 +1,194 @@
-import matplotlib.pyplot as plt
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import A4
-import tempfile
+# pdf_generator.py
+import hashlib
+import io
+import multiprocessing
 import os
+import tempfile
+import threading
+from xml.sax.saxutils import escape
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from app.records import as_pull_record
+
+# Chart rendering processes; 0 renders in the calling thread instead
+CHART_PROCESSES = int(os.getenv("PDF_CHART_PROCESSES", str(min(4, os.cpu_count() or 1))))
+CHART_CACHE_SIZE = int(os.getenv("PDF_CHART_CACHE_SIZE", "256"))
+# Reports stay in memory up to this size, then spill to an anonymous temp file
+PDF_SPOOL_MAX_BYTES = int(os.getenv("PDF_SPOOL_MAX_BYTES", str(16 * 1024 * 1024)))
+PDF_CHUNK_SIZE = 64 * 1024
+# Full-table reports: rows per LongTable chunk, and longest cell text kept
+TABLE_CHUNK_ROWS = int(os.getenv("PDF_TABLE_CHUNK_ROWS", "500"))
+CELL_CHARS = 60
+ISSUE_COLUMNS = ["ID", "Title", "State", "Assignee", "Labels"]
+
+_chart_pool = None
+_chart_pool_lock = threading.Lock()
+_chart_cache = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+
+def render_chart(spec):
+    """
+    Renders one chart spec to PNG bytes with the object-oriented Figure API on
+    an Agg canvas: no pyplot global state, so it is safe in threads and workers.
+    spec: (kind, title, labels, values, figsize, colors)
+    """
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    kind, title, labels, values, figsize, colors = spec
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    if kind == "pie":
+        ax.pie(values, labels=labels, autopct='%1.1f%%')
+    else:
+        ax.bar(labels, values, color=colors)
+    ax.set_title(title)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png")
+    return buf.getvalue()
+
+
+def get_chart_pool():
+    global _chart_pool
+    if _chart_pool is None and CHART_PROCESSES > 0:
+        with _chart_pool_lock:
+            if _chart_pool is None:
+                # spawn, not fork: the server process is multi-threaded
+                _chart_pool = ProcessPoolExecutor(CHART_PROCESSES, mp_context=multiprocessing.get_context("spawn"))
+    return _chart_pool
+
+
+def shutdown_chart_pool():
+    global _chart_pool
+    with _chart_pool_lock:
+        if _chart_pool is not None:
+            _chart_pool.shutdown(cancel_futures=True)
+            _chart_pool = None
+
+
+def chart_key(spec):
+    return hashlib.sha256(repr(spec).encode()).hexdigest()
+
+
+def render_charts(specs):
+    """
+    PNG bytes for each spec, in order. Charts are cached by a hash of their
+    spec (i.e. the counts they plot); misses render in parallel in the pool.
+    """
+    keys = [chart_key(spec) for spec in specs]
+    with _chart_cache_lock:
+        results = {key: _chart_cache[key] for key in keys if key in _chart_cache}
+        for key in results:
+            _chart_cache.move_to_end(key)
+    missing = {key: spec for key, spec in zip(keys, specs) if key not in results}
+    if missing:
+        pool = get_chart_pool()
+        if pool:
+            rendered = dict(zip(missing, pool.map(render_chart, missing.values())))
+        else:
+            rendered = {key: render_chart(spec) for key, spec in missing.items()}
+        with _chart_cache_lock:
+            for key, png in rendered.items():
+                _chart_cache[key] = png
+                _chart_cache.move_to_end(key)
+            while len(_chart_cache) > CHART_CACHE_SIZE:
+                _chart_cache.popitem(last=False)
+        results.update(rendered)
+    return [results[key] for key in keys]
+
+
+def iter_pdf_chunks(buffer, chunk_size=PDF_CHUNK_SIZE):
+    """
+    Yields the report in chunks and closes the buffer when done, or when the
+    consumer stops early (client disconnect), so nothing is left on disk.
+    """
+    try:
+        while chunk := buffer.read(chunk_size):
+            yield chunk
+    finally:
+        buffer.close()
 
-def generate_pdf_from_response(data, repo_stats=None, issues=None, prs=None):
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
-    doc = SimpleDocTemplate(tmp_file.name, pagesize=A4)
+
+def table_cell(value):
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(map(str, value))
+    if value is None or value == "":
+        return "-"
+    text = str(value)
+    return text if len(text) <= CELL_CHARS else text[:CELL_CHARS - 1] + "…"
+
+
+def iter_table_chunks(columns, rows, width, chunk_rows=None):
+    """
+    Yields LongTables of at most `chunk_rows` rows, each repeating the header
+    on every page. ReportLab re-splits a table's whole remainder at each page
+    break, so one huge table costs O(rows²); fixed-size chunks keep it linear.
+    Column widths are fixed up front ("Title" gets a triple share) so no
+    table has to measure its cells.
+    """
+    from reportlab.platypus import LongTable, TableStyle
+    from reportlab.lib import colors
+
+    chunk_rows = chunk_rows or TABLE_CHUNK_ROWS
+    weights = [3 if c == "Title" else 1 for c in columns]
+    col_widths = [width * w / sum(weights) for w in weights]
+    style = TableStyle([
+        ("FONTSIZE", (0, 0), (-1, -1), 7),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ])
+    chunk = []
+    for row in rows:
+        chunk.append([table_cell(value) for value in row])
+        if len(chunk) == chunk_rows:
+            yield LongTable([columns] + chunk, colWidths=col_widths, repeatRows=1, style=style)
+            chunk = []
+    if chunk:
+        yield LongTable([columns] + chunk, colWidths=col_widths, repeatRows=1, style=style)
+
+
+def pr_table_sections(table, audit_params=None):
+    """
+    (heading, columns, rows) for every full-report table over a PRTable: all
+    PRs, all reviews, then each audit section from app/audit_rules.py.
+    """
+    from app.audit_rules import evaluate_rules
+
+    pulls, reviews = table.pulls, table.reviews
+    fmt = "%Y-%m-%dT%H:%M:%SZ"
+    yield (f"Pull Requests ({len(pulls)})", ["PR ID", "Title", "State", "Created At", "Merged At", "Merged By"],
+           zip(pulls["number"], pulls["title"], pulls["state"], pulls["created_at"].dt.strftime(fmt),
+               pulls["merged_at"].dt.strftime(fmt).fillna("-"), pulls["merged_by"]))
+    yield (f"Reviews ({len(reviews)})", ["PR ID", "Reviewer", "Decision", "Submitted At"],
+           zip(reviews["number"], reviews["login"], reviews["state"], reviews["submitted_at"]))
+    for section in evaluate_rules(table, **(audit_params or {})).values():
+        yield section.title.replace("{count}", str(len(section.rows))), section.columns, section.rows
+
+
+def generate_pdf_from_response(data, repo_stats=None, issues=None, prs=None, output=None, full_tables=False, audit_params=None):
+    """
+    Builds the report into `output` (any binary file object). Without one, a
+    SpooledTemporaryFile is used: in memory for typical reports, an unnamed
+    temp file beyond PDF_SPOOL_MAX_BYTES. Returns the buffer rewound to the
+    start; closing it (see iter_pdf_chunks) releases everything.
+
+    repo_stats is a RepoInfo and issues IssueRecords (app/records.py);
+    `prs` may be PR dicts (any iterable) or a PRTable.
+
+    With full_tables, the report also carries every PR, review and issue and
+    each audit section in full, as chunked LongTables (see iter_table_chunks).
+    """
+    # Heavy imports are deferred to the first report so app startup stays fast
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.pagesizes import A4
+
+    buffer = output if output is not None else tempfile.SpooledTemporaryFile(max_size=PDF_SPOOL_MAX_BYTES)
+    doc = SimpleDocTemplate(buffer, pagesize=A4)
     styles = getSampleStyleSheet()
     story = []
 
@@ -22,61 +203,101 @@ def generate_pdf_from_response(data, repo_stats=None, issues=None, prs=None):
 
     if repo_stats:
         story.append(Paragraph("<b>Repository Metadata</b>", styles["Heading2"]))
-        story.append(Paragraph(f"Repo: {repo_stats.get('name')} ({repo_stats.get('owner')})", styles["Normal"]))
-        story.append(Paragraph(f"Description: {repo_stats.get('description')}", styles["Normal"]))
-        story.append(Paragraph(f"Stars: {repo_stats.get('stars')}, Forks: {repo_stats.get('forks')}", styles["Normal"]))
+        story.append(Paragraph(f"Repo: {repo_stats.name} ({repo_stats.owner})", styles["Normal"]))
+        story.append(Paragraph(f"Description: {repo_stats.description}", styles["Normal"]))
+        story.append(Paragraph(f"Stars: {repo_stats.stars}, Forks: {repo_stats.forks}", styles["Normal"]))
         story.append(Spacer(1, 12))
 
 
-    if prs:
-        status_counts = {"merged": 0, "open": 0, "closed": 0}
-        for pr in prs:
-            if pr.get("merged_at"):
+    status_counts = {"merged": 0, "open": 0, "closed": 0}
+
+    def count_status(prs):
+        for pr in map(as_pull_record, prs):
+            if pr.merged_at:
                 status_counts["merged"] += 1
-            elif pr["state"] == "open":
+            elif pr.state == "open":
                 status_counts["open"] += 1
             else:
                 status_counts["closed"] += 1
+            yield pr
 
-        plt.figure(figsize=(4,4))
-        plt.pie(status_counts.values(), labels=status_counts.keys(), autopct='%1.1f%%')
-        plt.title("Pull Request Status Distribution")
-        chart_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        plt.savefig(chart_file.name)
-        plt.close()
-        story.append(Image(chart_file.name, width=300, height=300))
-        story.append(Spacer(1, 12))
+    from app.pr_table import PRTable
+    pr_table = None
+    if isinstance(prs, PRTable):
+        # Already columnar (e.g. a prefetched snapshot's table)
+        pr_table = prs
+        status_counts.update(pr_table.status_counts())
+    elif full_tables:
+        # Counted while the (possibly streamed) PRs are read into the table
+        pr_table = PRTable.from_prs(count_status(prs or []))
+    else:
+        for _ in count_status(prs or []):
+            pass
 
-    # 📊 Graph 2: Issues over time
-    if issues:
-        dates = [i["created_at"][:10] for i in issues]
-        states = [i["state"] for i in issues]
-        open_count = sum(1 for s in states if s == "open")
-        closed_count = sum(1 for s in states if s == "closed")
-
-        plt.figure(figsize=(5,3))
-        plt.bar(["Open Issues", "Closed Issues"], [open_count, closed_count], color=["orange", "green"])
-        plt.title("Issues Overview")
-        chart_file2 = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
-        plt.savefig(chart_file2.name)
-        plt.close()
-        story.append(Image(chart_file2.name, width=300, height=200))
+    # Issues may be a generator (iter_issue_context), so counts and the
+    # summary rows are collected in a single pass.
+    open_count = closed_count = 0
+    top_issues = []
+    issue_rows = []
+    for i in issues or []:
+        if i.state == "open":
+            open_count += 1
+        elif i.state == "closed":
+            closed_count += 1
+        if len(top_issues) < 5:  # show top 5
+            top_issues.append(i)
+        if full_tables:
+            issue_rows.append((i.id, i.title, i.state, i.assignee, i.labels))
+
+    # 📊 Graph 1: PR status, Graph 2: Issues overview (rendered together off-thread)
+    charts = []
+    if any(status_counts.values()):
+        charts.append((("pie", "Pull Request Status Distribution", tuple(status_counts), tuple(status_counts.values()), (4, 4), None), 300, 300))
+    if top_issues:
+        charts.append((("bar", "Issues Overview", ("Open Issues", "Closed Issues"), (open_count, closed_count), (5, 3), ("orange", "green")), 300, 200))
+    for png, (_, width, height) in zip(render_charts([spec for spec, _, _ in charts]), charts):
+        story.append(Image(io.BytesIO(png), width=width, height=height))
         story.append(Spacer(1, 12))
 
+    if full_tables:
+        tables = list(pr_table_sections(pr_table, audit_params)) if len(pr_table) else []
+        tables.append((f"Issues ({len(issue_rows)})", ISSUE_COLUMNS, issue_rows))
+        for heading, columns, rows in tables:
+            story.append(Paragraph(f"<b>{escape(heading)}</b>", styles["Heading2"]))
+            story.extend(iter_table_chunks(columns, rows, doc.width))
+            story.append(Spacer(1, 12))
+
     # 📊 Table: Issues summary
-    if issues:
+    elif top_issues:
         story.append(Paragraph("<b>Issues Summary</b>", styles["Heading2"]))
-        table_data = [["ID", "Title", "State", "Assignee", "Labels"]]
-        for i in issues[:5]:  # show top 5
+        table_data = [ISSUE_COLUMNS]
+        for i in top_issues:
             table_data.append([
-                i["id"],
-                i["title"][:40],
-                i["state"],
-                i["assignee"] or "-",
-                ", ".join(i["labels"]) if i["labels"] else "-"
+                i.id,
+                i.title[:40],
+                i.state,
+                i.assignee or "-",
+                ", ".join(i.labels) if i.labels else "-"
             ])
         story.append(Table(table_data))
         story.append(Spacer(1, 12))
 
-    doc.build(story)
-    return tmp_file.name
+    try:
+        doc.build(story)
+    except BaseException:
+        if output is None:
+            buffer.close()
+        raise
+    buffer.seek(0)
+    return buffer
+
+
+def render_pdf_file(data, snapshot, path, full_tables=False, audit_params=None):
+    """
+    Writes a RepoSnapshot's report to `path` and returns its size; the entry
+    point for report worker processes, so the PDF never travels back as bytes.
+    """
+    with open(path, "wb") as f:
+        generate_pdf_from_response(data, snapshot.info, snapshot.issues, snapshot.table, output=f,
+                                   full_tables=full_tables, audit_params=audit_params)
+    return os.path.getsize(path)
@@ -0,0 +1,159 @@
+# pr_table.py
+import datetime
+import hashlib
+
+import numpy as np
+import pandas as pd
+from app.records import as_pull_record
+
+GITHUB_TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+
+
+class PRTable:
+    """
+    Columnar view of a repo's PRs: one row per PR in `pulls` and one row per
+    review in `reviews` (joined on `number`), with timestamps parsed once.
+
+    Audit checks are expressed as vectorized queries over these frames, backed
+    by indexes (reviewer -> reviews, state -> PRs, merged_at order, ...) that
+    are built once per table.
+    """
+
+    def __init__(self, pulls, reviews):
+        self.pulls = pulls
+        self.reviews = reviews
+        self._indexes = {}
+
+    @classmethod
+    def from_prs(cls, prs):
+        # Single pass over the (possibly streamed) PullRecords into plain column lists
+        numbers, titles, states, created, merged, merged_by, requested = [], [], [], [], [], [], []
+        rev_numbers, rev_logins, rev_states, rev_dates = [], [], [], []
+        for pr in map(as_pull_record, prs):
+            numbers.append(pr.number)
+            titles.append(pr.title)
+            states.append(pr.state)
+            created.append(pr.created_at)
+            merged.append(pr.merged_at)
+            merged_by.append(pr.merged_by or "Unknown")
+            requested.append(bool(pr.requested_reviewers))
+            for rev in pr.reviews:
+                rev_numbers.append(pr.number)
+                rev_logins.append(rev.login)
+                rev_states.append(rev.state)
+                rev_dates.append(rev.submitted_at)
+
+        pulls = pd.DataFrame({
+            "number": np.array(numbers, dtype=np.int64),
+            "title": pd.Series(titles, dtype=object),
+            "state": pd.Categorical(states),
+            "created_at": pd.to_datetime(pd.Series(created, dtype=object), format=GITHUB_TIME_FORMAT),
+            "merged_at": pd.to_datetime(pd.Series(merged, dtype=object), format=GITHUB_TIME_FORMAT),
+            "merged_by": pd.Series(merged_by, dtype=object),
+            "review_requested": np.array(requested, dtype=bool),
+        })
+        reviews = pd.DataFrame({
+            "number": np.array(rev_numbers, dtype=np.int64),
+            "login": pd.Series(rev_logins, dtype=object),
+            "state": pd.Categorical(rev_states),
+            "submitted_at": pd.Series(rev_dates, dtype=object),
+        })
+        reviews["login_lower"] = reviews["login"].str.lower()
+        return cls(pulls, reviews)
+
+    def __len__(self):
+        return len(self.pulls)
+
+    def status_counts(self):
+        """{"merged", "open", "closed"} PR counts, as charted in the PDF report."""
+        merged = self.pulls["merged_at"].notna()
+        is_open = (self.pulls["state"] == "open") & ~merged
+        return {"merged": int(merged.sum()), "open": int(is_open.sum()), "closed": int((~merged & ~is_open).sum())}
+
+    def index(self, name):
+        """
+        A named index over the table (see INDEX_BUILDERS), built on first use
+        and then reused by every query and audit rule on this table.
+        """
+        if name not in self._indexes:
+            self._indexes[name] = INDEX_BUILDERS[name](self)
+        return self._indexes[name]
+
+    def select(self, predicate):
+        """
+        Rows of `pulls` matching a predicate: either a DataFrame.query string
+        (e.g. "state == 'open' and not review_requested") or a callable
+        returning a boolean mask.
+        """
+        if callable(predicate):
+            return self.pulls[predicate(self.pulls)]
+        return self.pulls.query(predicate)
+
+    def pulls_in_state(self, state):
+        return self.pulls.iloc[self.index("by_state").get(state, EMPTY)]
+
+    def approvers(self, numbers):
+        """number -> list of approving logins (in review order), for the given PRs only."""
+        approved = self.reviews.iloc[self.index("by_review_state").get("APPROVED", EMPTY)]
+        approved = approved[approved["number"].isin(numbers)]
+        return approved.groupby("number", sort=False)["login"].agg(list)
+
+    def merged_without_approval(self):
+        positions, _ = self.index("merged_sorted")
+        merged = self.pulls.iloc[np.sort(positions)]
+        return merged[~merged["number"].isin(self.index("approved_numbers"))]
+
+    def reviewed_by(self, reviewer):
+        rows = self.reviews.iloc[self.index("by_reviewer").get(reviewer.lower(), EMPTY)]
+        return rows.assign(title=rows["number"].map(self.index("title_by_number")))
+
+    def waiting_for_review(self, hours=24, now=None):
+        now = now or datetime.datetime.utcnow()
+        open_prs = self.pulls_in_state("open")
+        open_prs = open_prs[~open_prs["review_requested"]]
+        waiting_hours = (pd.Timestamp(now) - open_prs["created_at"]).dt.total_seconds() / 3600
+        mask = waiting_hours > hours
+        return open_prs[mask].assign(waiting_hours=waiting_hours[mask].round(1))
+
+    def merged_since(self, since):
+        positions, merged_at = self.index("merged_sorted")
+        start = np.searchsorted(merged_at, np.datetime64(pd.Timestamp(since)), side="right")
+        rows = self.pulls.iloc[np.sort(positions[start:])]
+        approvers = rows["number"].map(self.approvers(rows["number"]))
+        return rows.assign(approvers=approvers.apply(lambda a: a if isinstance(a, list) else []))
+
+
+EMPTY = np.array([], dtype=np.int64)
+
+
+def _group_positions(column):
+    return {key: positions for key, positions in column.groupby(column, observed=True, sort=False).indices.items()}
+
+
+def _merged_sorted(table):
+    # Row positions of merged PRs ordered by merged_at, plus the sorted timestamps for searchsorted
+    merged_at = table.pulls["merged_at"].to_numpy()
+    positions = np.flatnonzero(~np.isnat(merged_at))
+    order = np.argsort(merged_at[positions], kind="stable")
+    return positions[order], merged_at[positions][order]
+
+
+def _fingerprint(table):
+    # Digest of the rows themselves, so it only changes with the data
+    digest = hashlib.sha256()
+    for frame in (table.pulls, table.reviews):
+        digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+INDEX_BUILDERS = {
+    "by_state": lambda table: _group_positions(table.pulls["state"]),
+    "by_reviewer": lambda table: _group_positions(table.reviews["login_lower"]),
+    "by_review_state": lambda table: _group_positions(table.reviews["state"]),
+    "merged_sorted": _merged_sorted,
+    "approved_numbers": lambda table: pd.unique(
+        table.reviews["number"].to_numpy()[table.index("by_review_state").get("APPROVED", EMPTY)]
+    ),
+    "title_by_number": lambda table: table.pulls.drop_duplicates("number").set_index("number")["title"],
+    "fingerprint": _fingerprint,
+}
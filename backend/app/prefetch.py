@@ -0,0 +1,107 @@
+# prefetch.py
+import os
+import random
+import threading
+
+from dotenv import load_dotenv, find_dotenv
+from app.github_client import rate_limit, quota_wait_seconds
+load_dotenv(find_dotenv(), override=False)
+
+PREFETCH_INTERVAL = float(os.getenv("PREFETCH_INTERVAL", "300"))
+PREFETCH_JITTER = float(os.getenv("PREFETCH_JITTER", "0.1"))
+# Stop refreshing when fewer than this many GitHub requests are left in the window
+RATE_LIMIT_FLOOR = int(os.getenv("PREFETCH_RATE_LIMIT_FLOOR", "100"))
+
+
+def configured_repos():
+    """
+    PREFETCH_REPOS="owner/repo,owner/other" or the GITHUB_OWNER/GITHUB_REPO pair.
+    """
+    raw = os.getenv("PREFETCH_REPOS") or (
+        f"{os.getenv('GITHUB_OWNER', 'vulnerable-apps')}/{os.getenv('GITHUB_REPO', 'juice-shop')}"
+    )
+    return [tuple(r.strip().split("/", 1)) for r in raw.split(",") if "/" in r]
+
+
+class SnapshotScheduler:
+    """
+    Keeps a prebuilt context snapshot per repo warm from a background thread,
+    so requests read the latest snapshot instead of crawling GitHub inline.
+    `build(owner, repo)` returns the snapshot (a RepoSnapshot: anything with
+    built_at and age()).
+    """
+
+    def __init__(self, build, repos=None, interval=PREFETCH_INTERVAL, jitter=PREFETCH_JITTER):
+        self.build = build
+        self.repos = repos if repos is not None else configured_repos()
+        self.interval = interval
+        self.jitter = jitter
+        self._snapshots = {}
+        self._build_locks = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="snapshot-prefetch", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def get(self, owner, repo):
+        """
+        Latest snapshot for the repo, rebuilt inline when none exists yet or
+        it is older than the refresh interval. Repos the background thread
+        keeps warm get twice the interval of slack (jitter, a slow build)
+        before a request pays for the rebuild.
+        """
+        snapshot = self._snapshots.get((owner, repo))
+        if snapshot is None or snapshot.age() > self._max_age(owner, repo):
+            snapshot = self.refresh(owner, repo)
+        return snapshot
+
+    def _max_age(self, owner, repo):
+        prefetched = (owner, repo) in self.repos and self._thread is not None and self._thread.is_alive()
+        return self.interval * 2 if prefetched else self.interval
+
+    def peek(self, owner, repo):
+        """Latest snapshot for the repo, or None; never builds one."""
+        return self._snapshots.get((owner, repo))
+
+    def refresh(self, owner, repo):
+        with self._lock:
+            build_lock = self._build_locks.setdefault((owner, repo), threading.Lock())
+        with build_lock:
+            # Another caller may have finished the build while we waited
+            snapshot = self._snapshots.get((owner, repo))
+            if snapshot and snapshot.age() < self.interval / 2:
+                return snapshot
+            snapshot = self.build(owner, repo)
+            self._snapshots[(owner, repo)] = snapshot
+            return snapshot
+
+    def _wait_for_quota(self):
+        delay = quota_wait_seconds(RATE_LIMIT_FLOOR)
+        if delay:
+            print(f"⏳ GitHub quota low ({rate_limit['remaining']} left), pausing prefetch for {delay:.0f}s")
+            self._stop.wait(delay)
+
+    def _run(self):
+        while not self._stop.is_set():
+            for owner, repo in self.repos:
+                if self._stop.is_set():
+                    return
+                self._wait_for_quota()
+                try:
+                    self.refresh(owner, repo)
+                except Exception as e:
+                    # Keep serving the previous snapshot
+                    print(f"❌ Prefetch failed for {owner}/{repo}:", e)
+            spread = self.interval * self.jitter
+            self._stop.wait(self.interval + random.uniform(-spread, spread))
@@ -0,0 +1,79 @@
+# query_router.py
+import re
+import threading
+import time
+from contextlib import contextmanager
+
+ROUTES = ("pr", "inventory", "mixed")
+
+# Keyword patterns per data source; a query naming neither goes to the PR path as before.
+# "audit" and "report" are left out: they describe inventory questions just as often.
+ROUTE_PATTERNS = {
+    "pr": re.compile(
+        r"\b(prs?|pull requests?|merge[ds]?|merging|reviews?|reviewe[dr]s?|approv\w*|branch\w*|commits?"
+        r"|issues?|repos?|repositor(?:y|ies)|github|contributors?)\b"
+    ),
+    "inventory": re.compile(
+        r"\b(laptops?|inventory|devices?|serial\w*|notebooks?|hardware|assets?|instore|in store|purchas\w*|bought"
+        r"|dell|macbook\w*|hp|lenovo|thinkpad|acer|asus|zenbook|surface|lg gram|[a-z]\d{4,})\b"
+    ),
+}
+
+# Per route: {stage: [total seconds, queries that went through the stage]}
+metrics = {route: {"queries": 0, "stages": {}, "last_ms": None} for route in ROUTES}
+_metrics_lock = threading.Lock()
+
+
+def classify(query):
+    """"pr", "inventory" or "mixed" (both sources needed for one answer)."""
+    q = query.lower()
+    matched = {route for route, pattern in ROUTE_PATTERNS.items() if pattern.search(q)}
+    if matched == {"pr", "inventory"}:
+        return "mixed"
+    return "inventory" if matched == {"inventory"} else "pr"
+
+
+class Timings(dict):
+    """Seconds spent per stage of one query ({stage: seconds}), plus "total"."""
+
+    def __init__(self):
+        super().__init__()
+        self.started = time.perf_counter()
+
+    def done(self):
+        self["total"] = time.perf_counter() - self.started
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self[name] = self.get(name, 0.0) + time.perf_counter() - start
+
+
+def record(route, timings):
+    with _metrics_lock:
+        m = metrics[route]
+        m["queries"] += 1
+        for stage, seconds in timings.items():
+            totals = m["stages"].setdefault(stage, [0.0, 0])
+            totals[0] += seconds
+            totals[1] += 1
+        m["last_ms"] = {stage: round(seconds * 1000, 1) for stage, seconds in timings.items()}
+
+
+def latency_breakdown():
+    """
+    Per route: query count, and average (over the queries that reached each
+    stage, e.g. only LLM-answered ones for "llm") and last milliseconds per stage.
+    """
+    with _metrics_lock:
+        return {
+            route: {
+                "queries": m["queries"],
+                "avg_ms": {stage: round(total * 1000 / count, 1) for stage, (total, count) in m["stages"].items()},
+                "last_ms": m["last_ms"],
+            }
+            for route, m in metrics.items()
+        }
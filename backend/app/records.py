@@ -0,0 +1,154 @@
+# records.py
+"""
+Compact projections of GitHub payloads. A REST PR is several KB of JSON
+(user, head/base repo blobs, _links, ...) of which the audit, context and
+PDF code read ten fields; records keep only those, in __slots__, with
+logins and states interned.
+"""
+import json
+import sys
+
+try:
+    import orjson  # optional; decodes GitHub's list pages several times faster
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
+
+def intern_login(login):
+    # A repo has few distinct users but many PRs/reviews/issues naming them
+    return sys.intern(login) if login else login
+
+
+class Record:
+    """
+    Base for small immutable records: fields are the subclass's __slots__,
+    set positionally once in __init__ and read-only afterwards.
+    """
+    __slots__ = ()
+
+    def __init__(self, *values):
+        if len(values) != len(self.__slots__):
+            raise TypeError(f"{type(self).__name__} takes {len(self.__slots__)} fields, got {len(values)}")
+        for name, value in zip(self.__slots__, values):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, name) for name in self.__slots__)
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_row(self):
+        """JSON-friendly list of field values (see from_row)."""
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(*row)
+
+
+class RepoInfo(Record):
+    __slots__ = ("name", "owner", "description", "stars", "forks", "default_branch", "license")
+
+    @classmethod
+    def from_dict(cls, info):
+        """From generate_repo_context's dict."""
+        return cls(*(info.get(name) for name in cls.__slots__))
+
+
+class ReviewRecord(Record):
+    __slots__ = ("login", "state", "submitted_at")
+
+    @classmethod
+    def from_github(cls, r):
+        # Reviews by deleted accounts come back with user: null
+        return cls(intern_login(r["user"]["login"]) if r.get("user") else "ghost", sys.intern(r["state"]), r.get("submitted_at"))
+
+    @classmethod
+    def from_row(cls, row):
+        login, state, submitted_at = row
+        return cls(intern_login(login), sys.intern(state), submitted_at)
+
+
+class PullRecord(Record):
+    __slots__ = ("url", "number", "title", "state", "created_at", "updated_at", "merged_at", "merged_by",
+                 "requested_reviewers", "reviews")
+
+    @classmethod
+    def from_github(cls, pr):
+        """From a REST pull payload (reviews too, if a "reviews" list was attached)."""
+        return cls(
+            pr.get("url"),
+            pr["number"],
+            pr["title"],
+            sys.intern(pr["state"]),
+            pr["created_at"],
+            pr.get("updated_at"),
+            pr.get("merged_at"),
+            intern_login(pr["merged_by"]["login"]) if pr.get("merged_by") else None,
+            tuple(intern_login(r["login"]) for r in pr.get("requested_reviewers") or ()),
+            tuple(ReviewRecord.from_github(r) for r in pr.get("reviews") or ()),
+        )
+
+    def with_reviews(self, reviews):
+        return PullRecord(*(getattr(self, name) for name in self.__slots__[:-1]), tuple(reviews))
+
+    def to_row(self):
+        row = super().to_row()
+        row[-2] = list(self.requested_reviewers)
+        row[-1] = [review.to_row() for review in self.reviews]
+        return row
+
+    @classmethod
+    def from_row(cls, row):
+        *fields, merged_by, requested, reviews = row
+        fields[3] = sys.intern(fields[3])
+        return cls(*fields, intern_login(merged_by), tuple(map(intern_login, requested)),
+                   tuple(ReviewRecord.from_row(r) for r in reviews))
+
+
+class IssueRecord(Record):
+    __slots__ = ("id", "title", "state", "assignee", "labels", "created_at", "updated_at")
+
+    @classmethod
+    def from_github(cls, i):
+        return cls(
+            i["number"],
+            i["title"],
+            sys.intern(i["state"]),
+            intern_login(i["assignee"]["login"]) if i.get("assignee") else None,
+            tuple(sys.intern(l["name"]) for l in i["labels"]),
+            i["created_at"],
+            i.get("updated_at"),
+        )
+
+    @property
+    def number(self):
+        return self.id
+
+    def to_row(self):
+        row = super().to_row()
+        row[4] = list(self.labels)
+        return row
+
+    @classmethod
+    def from_row(cls, row):
+        number, title, state, assignee, labels, created_at, updated_at = row
+        return cls(number, title, sys.intern(state), intern_login(assignee), tuple(map(sys.intern, labels)),
+                   created_at, updated_at)
+
+
+def as_pull_record(pr):
+    # Callers may still hand over REST dicts (e.g. generate_context_text(prs))
+    return PullRecord.from_github(pr) if isinstance(pr, dict) else pr
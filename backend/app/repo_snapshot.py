@@ -0,0 +1,40 @@
+# repo_snapshot.py
+import hashlib
+import time
+from types import MappingProxyType
+
+from app.records import Record
+
+
+class RepoSnapshot(Record):
+    """
+    Everything one context build read from GitHub for a repo: metadata, issues,
+    the PRTable and the rendered context sections. Built once per refresh and
+    shared read-only by prompt building, the LLM answer and the PDF report, so
+    no request crawls GitHub or copies the data again. The PRTable's frames
+    must be treated as read-only too.
+    """
+    __slots__ = ("owner", "repo", "info", "issues", "table", "sections", "built_at")
+
+    def __init__(self, owner, repo, info, issues, table, sections, built_at=None):
+        super().__init__(owner, repo, info, tuple(issues), table, MappingProxyType(dict(sections)),
+                         time.time() if built_at is None else built_at)
+
+    def __reduce__(self):
+        # mappingproxy can't be pickled; rebuild it from a plain dict
+        return type(self), (self.owner, self.repo, self.info, self.issues, self.table, dict(self.sections), self.built_at)
+
+    def age(self):
+        return time.time() - self.built_at
+
+    def fingerprint(self):
+        """
+        Digest of the data behind the snapshot, for answer cache keys. Unlike
+        the rendered audit sections (whose "Waiting Hours" move with the clock)
+        it only changes when the repo does: metadata, branches, the issue count
+        and latest update, and every PR and review row.
+        """
+        updated = max((issue.updated_at for issue in self.issues if issue.updated_at), default="")
+        raw = (f"{self.owner}/{self.repo}\0{self.info!r}\0{self.sections.get('branches', '')}"
+               f"\0{len(self.issues)}\0{updated}\0{self.table.index('fingerprint')}")
+        return hashlib.sha256(raw.encode()).hexdigest()
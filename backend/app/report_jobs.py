@@ -0,0 +1,281 @@
+# report_jobs.py
+import hashlib
+import multiprocessing
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from dotenv import load_dotenv, find_dotenv
+from app.pdf_generator import render_pdf_file
+from app.response_cache import normalize_query
+load_dotenv(find_dotenv(), override=False)
+
+# Report worker processes (and the threads that feed them)
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Queued + running jobs accepted before POST /reports answers 503
+REPORT_QUEUE_MAX = int(os.getenv("REPORT_QUEUE_MAX", "32"))
+# Seconds a finished report is kept for download
+REPORT_JOB_TTL = float(os.getenv("REPORT_JOB_TTL", "3600"))
+# Bytes of finished PDFs kept on disk; least recently downloaded are dropped first beyond this
+REPORT_STORE_MAX_BYTES = int(os.getenv("REPORT_STORE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Per-process report directory: reports-<pid>-<random>, so leftovers of dead servers can be found
+_REPORT_DIR = re.compile(r"reports-(\d+)-\w+")
+
+
+class QueueFull(Exception):
+    pass
+
+
+class ReportJob:
+    __slots__ = ("id", "key", "query", "full_tables", "owner", "repo", "snapshot_built_at", "status", "error",
+                 "path", "size", "created_at", "started_at", "finished_at", "last_access", "timings", "future")
+
+    def __init__(self, key, query, full_tables, owner, repo, snapshot_built_at):
+        self.id = uuid.uuid4().hex
+        self.key = key
+        self.query = query
+        self.full_tables = full_tables
+        self.owner = owner
+        self.repo = repo
+        self.snapshot_built_at = snapshot_built_at
+        self.status = "queued"
+        self.error = None
+        # The finished PDF lives in a temp file, not in memory (see ReportQueue)
+        self.path = None
+        self.size = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.last_access = self.created_at
+        self.timings = {}
+        self.future = None
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "query": self.query,
+            "full_tables": self.full_tables,
+            "repo": f"{self.owner}/{self.repo}",
+            "snapshot_built_at": self.snapshot_built_at,
+            "created_at": self.created_at,
+            "timings": {name: round(seconds, 3) for name, seconds in self.timings.items()},
+            "size_bytes": self.size,
+            "error": self.error,
+        }
+
+
+def _init_worker():
+    # Workers render their charts inline rather than nesting another process pool
+    from app import pdf_generator
+    pdf_generator.CHART_PROCESSES = 0
+
+
+def job_key(query, full_tables, snapshot):
+    raw = f"{normalize_query(query)}|{full_tables}|{snapshot.owner}/{snapshot.repo}|{snapshot.built_at}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ReportQueue:
+    """
+    PDF reports as background jobs. A job answers the query with
+    `answer(query, snapshot)` over the prefetched RepoSnapshot (no second
+    GitHub crawl) and renders the PDF from that same snapshot in a worker
+    process. Jobs for the same query and snapshot share one result, and at
+    most `max_queued` jobs are pending at once.
+
+    Finished PDFs are written by the worker to files in a private temp
+    directory and streamed from there, so they never sit in the server's
+    memory. A file is removed when its job expires (ttl) or, once finished
+    reports exceed max_bytes, least recently accessed first; stop() removes
+    the directory, and remove_stale_dirs() what a crashed server left behind.
+    """
+
+    def __init__(self, answer, snapshots, workers=REPORT_WORKERS, max_queued=REPORT_QUEUE_MAX, ttl=REPORT_JOB_TTL,
+                 max_bytes=REPORT_STORE_MAX_BYTES):
+        self.answer = answer
+        self.snapshots = snapshots
+        self.workers = workers
+        self.max_queued = max_queued
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._dir = None
+        self._jobs = {}
+        self._by_key = {}
+        self._lock = threading.Lock()
+        self._threads = None
+        self._processes = None
+
+    def _executors(self):
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(self.workers, thread_name_prefix="report-job")
+        if self._processes is None:
+            # spawn, not fork: the server process is multi-threaded
+            self._processes = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                                  initializer=_init_worker)
+        return self._threads, self._processes
+
+    def stop(self):
+        with self._lock:
+            for executor in (self._threads, self._processes):
+                if executor is not None:
+                    executor.shutdown(wait=False, cancel_futures=True)
+            self._threads = self._processes = None
+            for job in self._jobs.values():
+                job.path = None
+            self._jobs.clear()
+            self._by_key.clear()
+            if self._dir is not None:
+                shutil.rmtree(self._dir, ignore_errors=True)
+                self._dir = None
+
+    def submit(self, query, owner, repo, full_tables=False):
+        """
+        Returns (job, deduplicated). Blocks only if the repo has no snapshot
+        yet; raises QueueFull when max_queued jobs are already pending.
+        """
+        snapshot = self.snapshots.get(owner, repo)
+        key = job_key(query, full_tables, snapshot)
+        with self._lock:
+            self._expire()
+            job = self._by_key.get(key)
+            if job is not None and job.status != "failed":
+                return job, True
+            if sum(1 for j in self._jobs.values() if j.status in ("queued", "running")) >= self.max_queued:
+                raise QueueFull(f"{self.max_queued} reports already queued")
+            job = ReportJob(key, query, full_tables, owner, repo, snapshot.built_at)
+            self._jobs[job.id] = job
+            self._by_key[key] = job
+            if self._dir is None:
+                self._dir = tempfile.mkdtemp(prefix=f"reports-{os.getpid()}-")
+            job.path = os.path.join(self._dir, f"{job.id}.pdf")
+            threads, _ = self._executors()
+            job.future = threads.submit(self._run, job, snapshot)
+        return job, False
+
+    def get(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.last_access = time.time()
+        return job
+
+    def open_pdf(self, job):
+        """The finished report as an open binary file, or None if it has been evicted."""
+        path = job.path
+        try:
+            # Once open, the file stays readable even if the job is evicted mid-download
+            return open(path, "rb") if path else None
+        except FileNotFoundError:
+            return None
+
+    def _run(self, job, snapshot):
+        job.started_at = time.time()
+        job.status = "running"
+        job.timings["queued"] = job.started_at - job.created_at
+        try:
+            # The answer and the PDF are built from the same snapshot the job was keyed on
+            start = time.perf_counter()
+            response = self.answer(job.query, snapshot)
+            job.timings["answer"] = time.perf_counter() - start
+
+            data = {"query": job.query, "response": response}
+            with self._lock:
+                _, processes = self._executors()
+            start = time.perf_counter()
+            job.size = processes.submit(render_pdf_file, data, snapshot, job.path, job.full_tables).result()
+            job.timings["render"] = time.perf_counter() - start
+            job.status = "done"
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                # A worker died (e.g. OOM on a huge report); the next job gets a fresh pool
+                with self._lock:
+                    if self._processes is processes:
+                        self._processes = None
+            job.status = "failed"
+            job.error = str(e)
+            _remove(job.path)
+            job.path = None
+            print(f"❌ Report job {job.id} failed:", e)
+        finally:
+            job.finished_at = job.last_access = time.time()
+            job.timings["total"] = job.finished_at - job.created_at
+        with self._lock:
+            self._expire()
+        return job
+
+    def _drop(self, job):
+        del self._jobs[job.id]
+        if self._by_key.get(job.key) is job:
+            del self._by_key[job.key]
+        _remove(job.path)
+        job.path = None
+
+    def _expire(self):
+        cutoff = time.time() - self.ttl
+        for job in [j for j in self._jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            self._drop(job)
+        done = [j for j in self._jobs.values() if j.status == "done"]
+        stored = sum(j.size for j in done)
+        for job in sorted(done, key=lambda j: j.last_access):
+            if stored <= self.max_bytes:
+                break
+            stored -= job.size
+            self._drop(job)
+
+    def stats(self):
+        with self._lock:
+            counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            rendered = [j.timings["render"] for j in self._jobs.values() if "render" in j.timings]
+            stored = sum(j.size for j in self._jobs.values() if j.status == "done")
+        return {
+            **counts,
+            "stored_bytes": stored,
+            "workers": self.workers,
+            "max_queued": self.max_queued,
+            "avg_render_seconds": round(sum(rendered) / len(rendered), 3) if rendered else None,
+        }
+
+
+def _process_alive(pid):
+    if pid == os.getpid():
+        # Our pid, but a directory we didn't create yet: a previous server that had the same pid
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # exists, owned by someone else
+    return True
+
+
+def remove_stale_dirs(root=None):
+    """
+    Deletes report directories whose server process is gone (crash, kill -9),
+    which stop() never got to clean up. Call at startup, before any report.
+    Returns the number removed.
+    """
+    root = root or tempfile.gettempdir()
+    removed = 0
+    for name in os.listdir(root):
+        m = _REPORT_DIR.fullmatch(name)
+        if m and not _process_alive(int(m.group(1))):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+            removed += 1
+    return removed
+
+
+def _remove(path):
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
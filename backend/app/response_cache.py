@@ -0,0 +1,103 @@
+# response_cache.py
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from dotenv import load_dotenv, find_dotenv
+load_dotenv(find_dotenv(), override=False)
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "1") != "0"
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+RESPONSE_CACHE_PATH = os.getenv(
+    "RESPONSE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "responses.sqlite"),
+)
+
+
+def normalize_query(query):
+    # Case, whitespace and trailing punctuation don't change the question
+    return re.sub(r"\s+", " ", query.lower()).strip(" ?.!")
+
+
+def response_key(query, context):
+    """
+    Normalized query + fingerprint of the exact context sent to the model, so
+    any change in the underlying data yields a new key.
+    """
+    fingerprint = hashlib.sha256(context.encode()).hexdigest()
+    return hashlib.sha256(f"{normalize_query(query)}\0{fingerprint}".encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache of parsed LLM answers: an in-memory LRU in front of a
+    SQLite table, both expiring entries after `ttl` seconds.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_PATH, ttl=RESPONSE_CACHE_TTL, max_entries=RESPONSE_CACHE_SIZE):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = {"memory": 0, "disk": 0, "miss": 0}
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry and now - entry[1] < self.ttl:
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return entry[0]
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM responses WHERE key = ? AND stored_at > ?", (key, now - self.ttl)
+            ).fetchone()
+            if row is None:
+                self.hits["miss"] += 1
+                return None
+            value = json.loads(row[0])
+            self._remember(key, value, row[1])
+            self.hits["disk"] += 1
+            return value
+
+    def put(self, key, value):
+        now = time.time()
+        with self._lock:
+            self._remember(key, value, now)
+            self._conn.execute("INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, json.dumps(value), now))
+            self._conn.execute("DELETE FROM responses WHERE stored_at <= ?", (now - self.ttl,))
+            self._conn.commit()
+
+    def _remember(self, key, value, stored_at):
+        self._memory[key] = (value, stored_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    global _cache
+    if not RESPONSE_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache()
+    return _cache
@@ -0,0 +1,173 @@
+# sync_store.py
+import json
+import os
+import sqlite3
+import threading
+from itertools import islice
+
+from dotenv import load_dotenv, find_dotenv
+from app.github_client import DATA_SOURCE, PER_PAGE, fetch_reviews, iter_pulls, iter_issues
+from app import github_graphql
+from app.records import IssueRecord, PullRecord, json_loads
+load_dotenv(find_dotenv(), override=False)
+
+SYNC_ENABLED = os.getenv("GITHUB_INCREMENTAL_SYNC", "1") != "0"
+SYNC_PATH = os.getenv(
+    "GITHUB_SYNC_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "sync.sqlite"),
+)
+
+
+RECORD_TYPES = {"pulls": PullRecord, "issues": IssueRecord}
+
+
+class SyncStore:
+    """
+    Local copy of each repo's PRs (with reviews) and issues, plus the
+    updated_at high-water mark of the last sync per repo and kind.
+    """
+
+    def __init__(self, path=SYNC_PATH):
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sync_state (
+                owner TEXT, repo TEXT, kind TEXT, high_water TEXT,
+                PRIMARY KEY (owner, repo, kind)
+            );
+            CREATE TABLE IF NOT EXISTS pulls (
+                owner TEXT, repo TEXT, number INTEGER, updated_at TEXT, data TEXT,
+                PRIMARY KEY (owner, repo, number)
+            );
+            CREATE TABLE IF NOT EXISTS issues (
+                owner TEXT, repo TEXT, number INTEGER, updated_at TEXT, data TEXT,
+                PRIMARY KEY (owner, repo, number)
+            );
+        """)
+        self._conn.commit()
+
+    def high_water(self, owner, repo, kind):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water FROM sync_state WHERE owner = ? AND repo = ? AND kind = ?",
+                (owner, repo, kind),
+            ).fetchone()
+        return row[0] if row else None
+
+    def stored_updated_at(self, owner, repo, kind, numbers):
+        if not numbers:
+            return {}
+        marks = ",".join("?" * len(numbers))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT number, updated_at FROM {kind} WHERE owner = ? AND repo = ? AND number IN ({marks})",
+                (owner, repo, *numbers),
+            ).fetchall()
+        return dict(rows)
+
+    def upsert(self, owner, repo, kind, records, high_water):
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {kind} VALUES (?, ?, ?, ?, ?)",
+                [(owner, repo, r.number, r.updated_at, json.dumps(r.to_row())) for r in records],
+            )
+            if high_water:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?, ?)",
+                    (owner, repo, kind, high_water),
+                )
+            self._conn.commit()
+
+    def iter_records(self, owner, repo, kind):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM {kind} WHERE owner = ? AND repo = ? ORDER BY number DESC",
+                (owner, repo),
+            ).fetchall()
+        record_type = RECORD_TYPES[kind]
+        for (data,) in rows:
+            data = json_loads(data)
+            # Rows written before records were stored compactly hold the raw payload
+            yield record_type.from_row(data) if isinstance(data, list) else record_type.from_github(data)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SyncStore()
+    return _store
+
+
+def _sync_kind(store, owner, repo, kind, records, with_reviews=False):
+    """
+    Consumes `records` newest-first and stops past the previous high-water
+    mark. Only records whose updated_at moved are written (and have reviews
+    re-fetched).
+    """
+    since = store.high_water(owner, repo, kind)
+    newest = since
+    changed = 0
+    reached_mark = False
+    while not reached_mark:
+        batch = []
+        for record in islice(records, PER_PAGE):
+            # Strictly older only: timestamps have one-second precision, so a record updated in
+            # the mark's second may postdate the last sync (unchanged ones are filtered below)
+            if since and record.updated_at < since:
+                reached_mark = True
+                break
+            batch.append(record)
+        if not batch:
+            break
+        newest = max(newest or "", batch[0].updated_at)
+        stored = store.stored_updated_at(owner, repo, kind, [r.number for r in batch])
+        batch = [r for r in batch if stored.get(r.number) != r.updated_at]
+        if with_reviews:
+            # updated_at moved, so a cached reviews page may predate the change: ask GitHub
+            batch = fetch_reviews(batch, revalidate=True)
+        store.upsert(owner, repo, kind, batch, None)
+        changed += len(batch)
+    store.upsert(owner, repo, kind, [], newest)
+    return changed
+
+
+def sync_repo(owner, repo, store=None):
+    """
+    Brings the local store up to date with GitHub, fetching only PRs and
+    issues updated since the last run. Returns the number of changed records.
+    """
+    store = store or get_store()
+    since = store.high_water(owner, repo, "issues")
+    if DATA_SOURCE == "graphql":
+        # Reviews arrive nested in the PR pages, no per-PR follow-up needed
+        pulls = github_graphql.iter_pulls_with_reviews(owner, repo, order_by="UPDATED_AT")
+        changed = _sync_kind(store, owner, repo, "pulls", pulls)
+        issues = map(IssueRecord.from_github, github_graphql.iter_issues(owner, repo, since=since, order_by="UPDATED_AT"))
+        return changed + _sync_kind(store, owner, repo, "issues", issues)
+
+    pulls = iter_pulls(owner, repo, sort="updated", direction="desc")
+    changed = _sync_kind(store, owner, repo, "pulls", pulls, with_reviews=True)
+
+    issue_params = {"sort": "updated", "direction": "desc"}
+    if since:
+        issue_params["since"] = since
+    issues = (IssueRecord.from_github(i) for i in iter_issues(owner, repo, **issue_params) if "pull_request" not in i)
+    changed += _sync_kind(store, owner, repo, "issues", issues)
+    return changed
+
+
+def iter_synced_pulls(owner, repo, store=None):
+    return (store or get_store()).iter_records(owner, repo, "pulls")
+
+
+def iter_synced_issues(owner, repo, store=None):
+    return (store or get_store()).iter_records(owner, repo, "issues")
@@ -0,0 +1,77 @@
+# bench_concurrent_queries.py
+"""
+Load test: N concurrent /query requests against the FastAPI app, with GitHub
+served by the local mock and Gemini replaced by a fixed-latency stand-in.
+
+The non-blocking /query should finish a burst in roughly one model latency;
+/query-blocking (the previous synchronous handler, mounted here only for
+comparison) takes roughly N of them.
+
+Run from backend/:  python -m benchmarks.bench_concurrent_queries
+"""
+import asyncio
+import json
+import os
+import time
+
+import httpx
+
+from benchmarks.mock_github import MockGitHub
+
+MODEL_LATENCY = 0.5
+ANSWER = json.dumps({"description": "ok", "csv": []})
+
+
+class Answer:
+    text = ANSWER
+
+
+class SlowModel:
+    def generate_content(self, prompt):
+        time.sleep(MODEL_LATENCY)
+        return Answer()
+
+    async def generate_content_async(self, prompt):
+        await asyncio.sleep(MODEL_LATENCY)
+        return Answer()
+
+
+async def burst(client, path, n):
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(client.post(path, json={"query": f"question {i}"}) for i in range(n)))
+    assert all(r.status_code == 200 for r in responses)
+    return time.perf_counter() - start
+
+
+async def run(app):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        print(f"{'N':>4} | {'/query (s)':>10} | {'/query-blocking (s)':>19}")
+        for n in (1, 5, 10, 20):
+            concurrent = await burst(client, "/query", n)
+            blocking = await burst(client, "/query-blocking", n)
+            print(f"{n:>4} | {concurrent:>10.2f} | {blocking:>19.2f}")
+
+
+def main():
+    # Keep the benchmark off the on-disk caches so every request does the full work
+    os.environ.update({"GITHUB_CACHE": "0", "RESPONSE_CACHE": "0", "GITHUB_INCREMENTAL_SYNC": "0"})
+    with MockGitHub(num_prs=300, latency=0, owner="vulnerable-apps", repo="juice-shop") as mock:
+        os.environ["GITHUB_API_URL"] = mock.base_url
+        from fastapi import Request
+        import app.github_gemini_handler as handler
+        from main import app
+
+        handler.model = SlowModel()
+        handler.snapshots.refresh("vulnerable-apps", "juice-shop")
+
+        @app.post("/query-blocking")
+        async def query_blocking(request: Request):
+            body = await request.json()
+            return {"response": handler.run_query(body["query"])}
+
+        asyncio.run(run(app))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# bench_fast_path.py
+"""
+Fast-path answers for canonical audit questions: checks which questions are
+answered straight from the PRTable and which must go to Gemini (because they
+add a time window, a negation or an unknown reviewer the canned answer would
+ignore), then times the direct answers.
+
+Run from backend/:  python -m benchmarks.bench_fast_path
+"""
+import time
+
+from app.fast_path import answer_canonical, match_intent
+from app.pr_table import PRTable
+from benchmarks.bench_pr_table import synthetic_prs
+
+ROUNDS = 5
+
+# question -> intent answered directly
+FAST = {
+    "Which PRs were merged without approval?": "merged_without_approval",
+    "Which unapproved PRs were merged?": "merged_without_approval",
+    "How many PRs have been waiting for review more than 24 hours?": "waiting_for_review",
+    "PRs waiting for review for more than 2 days": "waiting_for_review",
+    "Which PRs were merged in the last 7 days?": "merged_recently",
+    "Show PRs reviewed by alice": "reviewed_by",
+}
+# Questions whose extra constraint the canned answers ignore
+LLM = [
+    "Is anything merged with no approvals since Monday?",
+    "Which PRs were merged without approval in 2024?",
+    "Which PRs were not merged and have no approval?",
+    "PRs merged without approval other than dependabot ones",
+    "Which PRs are not waiting for review?",
+    "Which PRs have been waiting for review since March?",
+    "PRs merged in the last 7 days in 2024",
+    "PRs reviewed by alice in the last week",
+    "PRs not reviewed by alice",
+    "PRs approved by someone",
+    "Which PRs did alice review?",  # no "reviewed by": free-form
+]
+
+
+def check_routing(table):
+    for question, intent in FAST.items():
+        matched = match_intent(question)
+        assert matched is not None and matched[0] == intent, (question, matched)
+        assert answer_canonical(question, table) is not None, question
+    for question in LLM:
+        assert answer_canonical(question, table) is None, question
+
+
+def main():
+    table = PRTable.from_prs(synthetic_prs(10_000))
+    check_routing(table)
+    print(f"routing: {len(FAST)} direct, {len(LLM)} to the LLM, as expected\n")
+
+    print(f"{'question':<62} | {'ms':>6} | rows")
+    for question in FAST:
+        start = time.perf_counter()
+        for _ in range(ROUNDS):
+            answer = answer_canonical(question, table)
+        elapsed = (time.perf_counter() - start) / ROUNDS
+        print(f"{question:<62} | {elapsed * 1000:>6.1f} | {len(answer['csv'])}")
+
+
+if __name__ == "__main__":
+    main()
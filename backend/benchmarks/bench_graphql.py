@@ -0,0 +1,48 @@
+# bench_graphql.py
+"""
+Requests and rate-limit points needed to build a repo's full context over
+REST vs GraphQL, against the local mock server. Both sources must produce
+byte-identical context text.
+
+Run from backend/:  python -m benchmarks.bench_graphql
+"""
+import os
+import time
+
+os.environ.update({"GITHUB_CACHE": "0", "GITHUB_INCREMENTAL_SYNC": "0"})
+
+from app import github_client, github_graphql
+from app import github_gemini_handler as handler
+from benchmarks.mock_github import MockGitHub
+
+
+def point_at(mock, source):
+    # Module-level config is read at import; redirect it to this mock
+    handler.GITHUB_API_URL = github_client.GITHUB_API_URL = github_graphql.GITHUB_API_URL = mock.base_url
+    github_client.GITHUB_GRAPHQL_URL = mock.base_url + "/graphql"
+    handler.DATA_SOURCE = source
+
+
+def build(mock, source):
+    point_at(mock, source)
+    mock.request_count = mock.graphql_cost = 0
+    start = time.perf_counter()
+    text = handler.join_context_sections(handler.build_repo_context(mock.owner, mock.repo).sections)
+    elapsed = time.perf_counter() - start
+    # REST charges one core point per request; GraphQL reports its own cost
+    cost = mock.graphql_cost if source == "graphql" else mock.request_count
+    return text, mock.request_count, cost, elapsed
+
+
+def main():
+    print(f"{'PRs':>6} | {'source':>7} | {'requests':>8} | {'points':>6} | {'time (s)':>8}")
+    for num_prs in (100, 500, 2000):
+        with MockGitHub(num_prs=num_prs, num_issues=num_prs // 2, latency=0.01) as mock:
+            results = {source: build(mock, source) for source in ("rest", "graphql")}
+        assert results["rest"][0] == results["graphql"][0], "REST and GraphQL contexts differ"
+        for source, (_, requests_made, cost, elapsed) in results.items():
+            print(f"{num_prs:>6} | {source:>7} | {requests_made:>8} | {cost:>6} | {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
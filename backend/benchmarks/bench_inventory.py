@@ -0,0 +1,77 @@
+# bench_inventory.py
+"""
+Inventory question cost: the old path (read_csv + to_csv of the whole file on
+every question) vs the cached typed frame with vectorized filters. Reports
+per-question latency and the prompt characters that would go to Gemini.
+
+Run from backend/:  python -m benchmarks.bench_inventory
+"""
+import datetime
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from app.inventory import answer_inventory, get_inventory, inventory_context
+
+MODELS = ["Dell XPS", "MacBook Pro", "HP Elite", "Lenovo ThinkPad", "Acer Aspire", "Asus ZenBook", "Dell Latitude",
+          "HP Spectre", "Microsoft Surface", "LG Gram"]
+OWNERS = ["Ravi", "Anya", "Arjun", "Priya", "Neha", "Aman", "Vivek", "Sanya", "Aisha", "Dev"]
+QUESTIONS = [
+    "Which laptops are in store?",
+    "How many HP laptops were bought in 2024?",
+    "List Dell laptops owned by Ravi",
+    "Which MacBook Pro laptops should we replace first?",
+    "Which laptops are not active?",
+    "List laptops except Dell ones",
+]
+ROUNDS = 5
+
+
+def write_inventory(path, rows):
+    start = datetime.date(2020, 1, 1)
+    with open(path, "w") as f:
+        f.write("SerialNo,Model,Owner,Status,PurchaseDate\n")
+        for n in range(rows):
+            status = "InStore" if n % 5 == 0 else "Active"
+            owner = "–" if status == "InStore" else OWNERS[n % len(OWNERS)]
+            f.write(f"L{n:07d},{MODELS[n % len(MODELS)]},{owner},{status},{start + datetime.timedelta(days=n % 2000)}\n")
+
+
+def legacy_context(path):
+    df = pd.read_csv(path)
+    return "CSV DATA:\n" + df.to_csv(index=False)
+
+
+def check_negation(inventory):
+    # Direct answers must honour "not"/"except", not return the very rows excluded
+    rows = answer_inventory("Which laptops are not active?", inventory)["csv"]
+    assert rows and all(row["Status"] != "Active" for row in rows)
+    rows = answer_inventory("List laptops except Dell ones", inventory)["csv"]
+    assert rows and not any(row["Model"].startswith("Dell") for row in rows)
+    assert len(rows) == len(inventory) - sum(model.startswith("Dell") for model in inventory.frame["Model"])
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        result = fn(*args)
+    return (time.perf_counter() - start) / ROUNDS, result
+
+
+def main():
+    print(f"{'rows':>7} | {'question':<50} | {'old (ms)':>8} | {'new (ms)':>8} | {'old prompt':>10} | new prompt")
+    for rows in (1_000, 10_000, 100_000):
+        path = os.path.join(tempfile.mkdtemp(), "inventory.csv")
+        write_inventory(path, rows)
+        check_negation(get_inventory(path))  # first question pays the parse once
+        for question in QUESTIONS:
+            old, old_text = timed(legacy_context, path)
+            new, (answer, text) = timed(lambda q: inventory_context(q, get_inventory(path)), question)
+            sent = "answered" if answer is not None else f"{len(text):,}"
+            print(f"{rows:>7} | {question:<50} | {old * 1000:>8.1f} | {new * 1000:>8.1f} | {len(old_text):>10,} | {sent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# bench_pdf_charts.py
+"""
+Concurrent PDF reports: the old pyplot + temp-PNG charts vs Figure/Agg charts
+rendered in a process pool and cached by their counts. Also counts the PNG
+temp files each approach leaves behind.
+
+Run from backend/:  python -m benchmarks.bench_pdf_charts
+"""
+import glob
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import pdf_generator
+from app.pdf_generator import generate_pdf_from_response, render_charts, shutdown_chart_pool
+from app.records import IssueRecord, PullRecord
+
+REPORTS = 16
+THREADS = 8
+
+
+def pyplot_chart(spec):
+    # What generate_pdf_from_response used to do for each chart
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    kind, title, labels, values, figsize, colors = spec
+    plt.figure(figsize=figsize)
+    if kind == "pie":
+        plt.pie(values, labels=labels, autopct='%1.1f%%')
+    else:
+        plt.bar(labels, values, color=colors)
+    plt.title(title)
+    chart_file = tempfile.NamedTemporaryFile(delete=False, suffix=".png")
+    plt.savefig(chart_file.name)
+    plt.close()
+    with open(chart_file.name, "rb") as f:
+        return f.read()
+
+
+def report_inputs(n):
+    prs = [PullRecord(None, k, f"Change {k}", "open" if k % (n + 2) == 0 else "closed", "2025-01-01T00:00:00Z", None,
+                      "2025-01-02T00:00:00Z" if k % 3 else None, None, (), ()) for k in range(50 + n)]
+    issues = [IssueRecord(k, f"Issue {k}", "open" if k % (n + 2) else "closed", None, (), None, None) for k in range(20 + n)]
+    return prs, issues
+
+
+def run(label):
+    before = set(glob.glob(os.path.join(tempfile.gettempdir(), "*.png")))
+    start = time.perf_counter()
+    with ThreadPoolExecutor(THREADS) as pool:
+        buffers = list(pool.map(lambda n: generate_pdf_from_response({"query": "q", "response": "r"}, None, *reversed(report_inputs(n))), range(REPORTS)))
+    elapsed = time.perf_counter() - start
+    leaked = set(glob.glob(os.path.join(tempfile.gettempdir(), "*.png"))) - before
+    for buffer in buffers:
+        buffer.close()
+    for path in leaked:
+        os.remove(path)
+    print(f"{label:>28} | {elapsed:>8.2f} | {len(leaked):>11}")
+
+
+def main():
+    print(f"{REPORTS} reports on {THREADS} threads\n")
+    print(f"{'charts':>28} | {'time (s)':>8} | {'leaked PNGs':>11}")
+    # pyplot's global state is not thread-safe; the old code relied on luck here
+    pdf_generator.render_charts = lambda specs: [pyplot_chart(spec) for spec in specs]
+    run("pyplot + temp files")
+    pdf_generator.render_charts = render_charts
+
+    pdf_generator.CHART_PROCESSES = 0
+    run("Figure/Agg, inline")
+    pdf_generator._chart_cache.clear()
+    pdf_generator.CHART_PROCESSES = os.cpu_count() or 1
+    render_charts([("bar", "warm-up", ("a",), (1,), (1, 1), None)])  # start the workers outside the timing
+    run("Figure/Agg, process pool")
+    run("Figure/Agg, cached")
+    shutdown_chart_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+# bench_pdf_stream.py
+"""
+Memory and latency of building and sending a report as the number of PRs and
+issues grows: the old NamedTemporaryFile(delete=False) + FileResponse flow vs
+the spooled buffer streamed in chunks.
+
+Run from backend/:  python -m benchmarks.bench_pdf_stream
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+
+os.environ["PDF_CHART_PROCESSES"] = "0"  # keep all allocations in this process for tracemalloc
+
+from app import pdf_generator
+from app.pdf_generator import PDF_CHUNK_SIZE, generate_pdf_from_response, iter_pdf_chunks
+from app.records import IssueRecord
+
+
+def report_inputs(rows):
+    prs = [{"number": n, "title": f"Change {n}", "state": "closed" if n % 4 else "open",
+            "created_at": "2025-01-01T00:00:00Z", "merged_at": "2025-01-01T00:00:00Z" if n % 3 else None,
+            "reviews": []} for n in range(rows)]
+    issues = [IssueRecord(n, f"Issue {n}", "open" if n % 3 else "closed", None, ("bug",) if n % 4 == 0 else (), None, None)
+              for n in range(rows)]
+    return prs, issues
+
+
+def temp_file_report(data, prs, issues):
+    # The old flow: build to a named file, FileResponse reads it back, nobody deletes it
+    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".pdf")
+    generate_pdf_from_response(data, None, issues, prs, output=tmp_file)
+    tmp_file.close()
+    with open(tmp_file.name, "rb") as f:
+        while f.read(PDF_CHUNK_SIZE):
+            pass
+    return tmp_file.name
+
+
+def streamed_report(data, prs, issues):
+    for _ in iter_pdf_chunks(generate_pdf_from_response(data, None, issues, prs)):
+        pass
+
+
+def measure(fn, rows):
+    prs, issues = report_inputs(rows)
+    data = {"query": "Which PRs were merged without approval?", "response": "See tables."}
+    pdf_generator._chart_cache.clear()  # both flows render their charts
+    before = set(os.listdir(tempfile.gettempdir()))
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn(data, prs, issues)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    left = set(os.listdir(tempfile.gettempdir())) - before
+    for name in left:
+        os.remove(os.path.join(tempfile.gettempdir(), name))
+    return elapsed, peak / 2**20, len(left)
+
+
+def main():
+    streamed_report({"query": "", "response": ""}, *report_inputs(10))  # imports and fonts outside the timing
+    print(f"{'rows':>6} | {'flow':>9} | {'time (s)':>8} | {'peak MiB':>8} | {'files left':>10}")
+    for rows in (1000, 5000, 20000):
+        for name, fn in (("temp file", temp_file_report), ("streamed", streamed_report)):
+            elapsed, peak, left = measure(fn, rows)
+            print(f"{rows:>6} | {name:>9} | {elapsed:>8.2f} | {peak:>8.1f} | {left:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# bench_pdf_tables.py
+"""
+Full-table report generation time and peak memory as the PR count grows,
+with rows chunked into LongTables vs a single LongTable per section.
+
+Run from backend/:  python -m benchmarks.bench_pdf_tables [max_prs]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ["PDF_CHART_PROCESSES"] = "0"
+
+from app import pdf_generator
+from app.pdf_generator import generate_pdf_from_response
+from app.records import IssueRecord
+from benchmarks.mock_github import make_issues, make_prs, make_reviews
+
+SIZES = (1000, 5000, 10000, 25000, 50000)
+SINGLE_TABLE_MAX = 5000  # beyond this one un-chunked table takes minutes
+
+
+def report_inputs(num_prs):
+    prs = make_prs("http://mock", "mock-org", "mock-repo", num_prs)
+    for pr in prs:
+        pr["reviews"] = make_reviews(pr) if pr["state"] == "closed" else []
+    issues = [IssueRecord.from_github(i) for i in make_issues("mock-org", "mock-repo", num_prs // 2)]
+    return prs, issues
+
+
+def build(prs, issues, chunk_rows, traced):
+    pdf_generator.TABLE_CHUNK_ROWS = chunk_rows
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    buffer = generate_pdf_from_response({"query": "q", "response": "r"}, None, iter(issues), iter(prs), full_tables=True)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 2**20 if traced else None
+    tracemalloc.stop()
+    size = buffer.seek(0, os.SEEK_END) / 2**20
+    buffer.close()
+    return elapsed, peak, size
+
+
+def main():
+    max_prs = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    chunk_rows = pdf_generator.TABLE_CHUNK_ROWS
+    build(*report_inputs(50), chunk_rows, False)  # imports and fonts outside the timing
+    print(f"{'PRs':>6} | {'tables':>12} | {'time (s)':>8} | {'µs/PR':>6} | {'peak MiB':>8} | {'PDF MiB':>7}")
+    for num_prs in (n for n in SIZES if n <= max_prs):
+        prs, issues = report_inputs(num_prs)
+        variants = [(f"chunks of {chunk_rows}", chunk_rows)]
+        if num_prs <= SINGLE_TABLE_MAX:
+            variants.append(("single", 10**9))
+        for label, rows in variants:
+            elapsed, _, size = build(prs, issues, rows, traced=False)
+            _, peak, _ = build(prs, issues, rows, traced=True)
+            print(f"{num_prs:>6} | {label:>12} | {elapsed:>8.2f} | {elapsed / num_prs * 1e6:>6.0f} | {peak:>8.1f} | {size:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
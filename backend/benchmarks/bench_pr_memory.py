@@ -0,0 +1,157 @@
+# bench_pr_memory.py
+"""
+Memory held per PR once a repo's PRs (and closed PRs' reviews) are fetched:
+the raw REST payloads as before vs the PullRecord projections, measured with
+tracemalloc over GitHub-sized JSON pages. Also times page decoding with the
+stdlib json module vs orjson (when installed).
+
+Run from backend/:  python -m benchmarks.bench_pr_memory
+"""
+import gc
+import json
+import time
+import tracemalloc
+
+from app.records import PullRecord, ReviewRecord, json_loads
+from benchmarks.mock_github import make_prs, make_reviews
+
+PAGE_SIZE = 100
+BASE_URL = "https://api.github.com"
+
+
+def user_payload(login):
+    # The user object GitHub nests wherever an account appears
+    url = f"{BASE_URL}/users/{login}"
+    user_id = sum(map(ord, login)) * 7919
+    return {
+        "login": login, "id": user_id, "node_id": "MDQ6VXNlcjE=", "type": "User", "site_admin": False,
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{user_id}?v=4", "gravatar_id": "",
+        "url": url, "html_url": f"https://github.com/{login}", "followers_url": url + "/followers",
+        "following_url": url + "/following{/other_user}", "gists_url": url + "/gists{/gist_id}",
+        "starred_url": url + "/starred{/owner}{/repo}", "subscriptions_url": url + "/subscriptions",
+        "organizations_url": url + "/orgs", "repos_url": url + "/repos", "events_url": url + "/events{/privacy}",
+        "received_events_url": url + "/received_events",
+    }
+
+
+def repo_payload(owner, repo):
+    url = f"{BASE_URL}/repos/{owner}/{repo}"
+    payload = {"id": 123456, "node_id": "MDEwOlJlcG9zaXRvcnkx", "name": repo, "full_name": f"{owner}/{repo}",
+               "private": False, "owner": user_payload(owner), "html_url": f"https://github.com/{owner}/{repo}",
+               "description": "Synthetic repository", "fork": False, "url": url, "default_branch": "main",
+               "stargazers_count": 42, "watchers_count": 42, "forks_count": 7, "open_issues_count": 3}
+    for name in ("forks", "keys", "collaborators", "teams", "hooks", "issue_events", "events", "assignees",
+                 "branches", "tags", "blobs", "git_tags", "git_refs", "trees", "statuses", "languages",
+                 "stargazers", "contributors", "subscribers", "subscription", "commits", "git_commits", "comments",
+                 "issue_comment", "contents", "compare", "merges", "archive", "downloads", "issues", "pulls",
+                 "milestones", "notifications", "labels", "releases", "deployments"):
+        payload[f"{name}_url"] = f"{url}/{name}"
+    return payload
+
+
+def full_pull(pr, owner, repo):
+    """A mock PR padded out to the fields (and size) of a real REST pull payload."""
+    url = pr["url"]
+    html = f"https://github.com/{owner}/{repo}/pull/{pr['number']}"
+    return {
+        **pr,
+        "id": 10**9 + pr["number"], "node_id": "PR_kwDOABCDEF", "html_url": html, "diff_url": html + ".diff",
+        "patch_url": html + ".patch", "issue_url": f"{BASE_URL}/repos/{owner}/{repo}/issues/{pr['number']}",
+        "commits_url": url + "/commits", "review_comments_url": url + "/comments",
+        "comments_url": f"{BASE_URL}/repos/{owner}/{repo}/issues/{pr['number']}/comments",
+        "statuses_url": f"{BASE_URL}/repos/{owner}/{repo}/statuses/{'0' * 40}",
+        "locked": False, "body": "Synthetic description. " * 8, "closed_at": pr["merged_at"],
+        "user": user_payload(pr["user"]["login"]),
+        "merged_by": user_payload(pr["merged_by"]["login"]) if pr["merged_by"] else None,
+        "requested_reviewers": [user_payload(r["login"]) for r in pr["requested_reviewers"]],
+        "labels": [], "assignees": [], "requested_teams": [], "milestone": None, "draft": False,
+        "merge_commit_sha": "f" * 40, "author_association": "CONTRIBUTOR", "auto_merge": None,
+        "head": {"label": f"{owner}:feature-{pr['number']}", "ref": f"feature-{pr['number']}", "sha": "a" * 40,
+                 "user": user_payload(owner), "repo": repo_payload(owner, repo)},
+        "base": {"label": f"{owner}:main", "ref": "main", "sha": "b" * 40,
+                 "user": user_payload(owner), "repo": repo_payload(owner, repo)},
+        "_links": {name: {"href": f"{url}/{name}"} for name in
+                   ("self", "html", "issue", "comments", "review_comments", "review_comment", "commits", "statuses")},
+    }
+
+
+def full_review(review, pr):
+    return {**review, "id": 10**8 + pr["number"], "node_id": "PRR_kwDOABCDEF",
+            "user": user_payload(review["user"]["login"]), "body": "", "commit_id": "c" * 40,
+            "html_url": f"{pr['url']}#pullrequestreview", "pull_request_url": pr["url"],
+            "author_association": "CONTRIBUTOR",
+            "_links": {"html": {"href": pr["url"]}, "pull_request": {"href": pr["url"]}}}
+
+
+def make_pages(num_prs, owner="mock-org", repo="mock-repo"):
+    """JSON bodies as GitHub would send them: PR list pages and one review page per closed PR."""
+    prs = make_prs(BASE_URL, owner, repo, num_prs)
+    pr_pages = [json.dumps([full_pull(pr, owner, repo) for pr in prs[k:k + PAGE_SIZE]]).encode()
+                for k in range(0, len(prs), PAGE_SIZE)]
+    review_pages = {pr["url"]: json.dumps([full_review(r, pr) for r in make_reviews(pr)]).encode()
+                    for pr in prs if pr["state"] == "closed"}
+    return pr_pages, review_pages
+
+
+def load_raw(pr_pages, review_pages, loads):
+    # Before: every decoded payload is kept, reviews attached under pr["reviews"]
+    prs = []
+    for page in pr_pages:
+        for pr in loads(page):
+            pr["reviews"] = loads(review_pages[pr["url"]]) if pr["state"] == "closed" else []
+            prs.append(pr)
+    return prs
+
+
+def load_records(pr_pages, review_pages, loads):
+    # After: each page is projected to PullRecords and dropped
+    prs = []
+    for page in pr_pages:
+        for pr in map(PullRecord.from_github, loads(page)):
+            if pr.state == "closed":
+                pr = pr.with_reviews(map(ReviewRecord.from_github, loads(review_pages[pr.url])))
+            prs.append(pr)
+    return prs
+
+
+def retained_bytes(load, *args):
+    gc.collect()
+    tracemalloc.start()
+    result = load(*args)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current, peak
+
+
+def decode_seconds(pages, loads):
+    start = time.perf_counter()
+    for page in pages:
+        loads(page)
+    return time.perf_counter() - start
+
+
+def main():
+    num_prs = 10_000
+    pr_pages, review_pages = make_pages(num_prs)
+    payload = sum(map(len, pr_pages)) + sum(map(len, review_pages.values()))
+    print(f"{num_prs} PRs, {len(review_pages)} review pages, {payload / num_prs / 1024:.1f} KiB of JSON per PR\n")
+
+    print(f"{'layout':>16} | {'retained / PR':>13} | {'peak / PR':>9} | {'total retained':>14}")
+    for name, load in (("raw dicts", load_raw), ("PullRecords", load_records)):
+        current, peak = retained_bytes(load, pr_pages, review_pages, json_loads)
+        print(f"{name:>16} | {current / num_prs:>11,.0f} B | {peak / num_prs:>7,.0f} B | "
+              f"{current / 1024 / 1024:>10.1f} MiB")
+
+    pages = pr_pages + list(review_pages.values())
+    print(f"\ndecoding all pages: json {decode_seconds(pages, json.loads):.2f}s", end="")
+    try:
+        import orjson
+        print(f", orjson {decode_seconds(pages, orjson.loads):.2f}s")
+    except ImportError:
+        print(" (orjson not installed; pip install orjson to compare)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# bench_pr_table.py
+"""
+Audit section timing: the original four Python loops vs the columnar PRTable.
+
+Run from backend/:  python -m benchmarks.bench_pr_table
+"""
+import datetime
+import time
+
+from app.pr_table import PRTable
+from benchmarks.mock_github import make_prs, make_reviews
+
+
+def legacy_sections(prs, reference_reviewer="alice"):
+    # The four passes generate_context_text used to make, minus the formatting
+    now = datetime.datetime.utcnow()
+    merged_no_approval = [pr for pr in prs if pr["merged_at"] and not any(r["state"] == "APPROVED" for r in pr["reviews"])]
+    reviewed = [(pr, rev) for pr in prs for rev in pr["reviews"] if rev["user"]["login"].lower() == reference_reviewer]
+    waiting = [
+        pr for pr in prs
+        if pr["state"] == "open" and not pr.get("requested_reviewers")
+        and (now - datetime.datetime.strptime(pr["created_at"], "%Y-%m-%dT%H:%M:%SZ")).total_seconds() / 3600 > 24
+    ]
+    week_ago = now - datetime.timedelta(days=7)
+    last7 = [
+        (pr, [r["user"]["login"] for r in pr["reviews"] if r["state"] == "APPROVED"]) for pr in prs
+        if pr["merged_at"] and datetime.datetime.strptime(pr["merged_at"], "%Y-%m-%dT%H:%M:%SZ") > week_ago
+    ]
+    return len(merged_no_approval), len(reviewed), len(waiting), len(last7)
+
+
+def columnar_sections(table, reference_reviewer="alice"):
+    now = datetime.datetime.utcnow()
+    return (
+        len(table.merged_without_approval()),
+        len(table.reviewed_by(reference_reviewer)),
+        len(table.waiting_for_review(24, now)),
+        len(table.merged_since(now - datetime.timedelta(days=7))),
+    )
+
+
+def synthetic_prs(n):
+    prs = make_prs("http://mock", "mock-org", "mock-repo", n)
+    for pr in prs:
+        pr["reviews"] = make_reviews(pr)
+    return prs
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"{'PRs':>7} | {'loops (s)':>9} | {'build table (s)':>15} | {'queries (s)':>11} | {'custom predicate (s)':>20}")
+    for n in (10_000, 100_000):
+        prs = synthetic_prs(n)
+        loops, expected = timed(legacy_sections, prs)
+        build, table = timed(PRTable.from_prs, prs)
+        queries, got = timed(columnar_sections, table)
+        assert got == expected, (got, expected)
+        custom, _ = timed(table.select, "state == 'closed' and merged_at.isnull() and not review_requested")
+        print(f"{n:>7} | {loops:>9.3f} | {build:>15.3f} | {queries:>11.3f} | {custom:>20.4f}")
+
+
+if __name__ == "__main__":
+    main()
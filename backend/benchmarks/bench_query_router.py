@@ -0,0 +1,80 @@
+# bench_query_router.py
+"""
+Per-route latency breakdown of run_query on a cold start (no repo snapshot,
+inventory not yet parsed), with GitHub served by the local mock and Gemini
+replaced by a fixed-latency stand-in. Shows that inventory questions make no
+GitHub requests, and that mixed questions build both contexts at once rather
+than one after the other.
+
+Run from backend/:  python -m benchmarks.bench_query_router
+"""
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+os.environ.update({"GITHUB_CACHE": "0", "RESPONSE_CACHE": "0", "GITHUB_INCREMENTAL_SYNC": "0"})
+
+from app import github_client, inventory
+import app.github_gemini_handler as handler
+from app.query_router import Timings, classify, latency_breakdown
+from benchmarks.bench_concurrent_queries import SlowModel
+from benchmarks.bench_inventory import write_inventory
+from benchmarks.mock_github import MockGitHub
+
+QUESTIONS = [
+    "How many PRs have been waiting for review more than 24 hours?",
+    "Which PRs touched the login flow and why were they risky?",
+    "Which laptops are in store?",
+    "Which MacBook Pro laptops should we replace first?",
+    "Which reviewers merged PRs last week and which laptops do they own?",
+]
+STAGES = ("snapshot", "pr_context", "inventory_context", "contexts", "llm", "total")
+
+
+def cold_start():
+    handler.snapshots._snapshots.clear()
+    inventory._inventory = None
+
+
+def sequential_contexts(question):
+    # What a mixed question cost when the two contexts were built one after the other
+    timings = Timings()
+    start = time.perf_counter()
+    handler.pr_part(question, None, False, timings)
+    handler.inventory_part(question, False, timings)
+    return time.perf_counter() - start
+
+
+def main():
+    path = os.path.join(tempfile.mkdtemp(), "inventory.csv")
+    write_inventory(path, 100_000)
+    inventory.INVENTORY_CSV = path
+    handler.model = SlowModel()
+
+    with MockGitHub(num_prs=500, latency=0.02, owner=handler.GITHUB_OWNER, repo=handler.GITHUB_REPO) as mock:
+        github_client.GITHUB_API_URL = handler.GITHUB_API_URL = mock.base_url
+
+        print("500 PRs (20 ms per GitHub request), 100k inventory rows, 0.5 s model; cold start per question\n")
+        print(f"{'route':>9} | {'GitHub reqs':>11} | " + " | ".join(f"{s:>17}" for s in STAGES) + " | question")
+        for question in QUESTIONS:
+            cold_start()
+            before = mock.request_count
+            with contextlib.redirect_stdout(io.StringIO()):  # run_query echoes the raw model reply
+                handler.run_query(question)
+            route = classify(question)
+            last = latency_breakdown()[route]["last_ms"]
+            cells = " | ".join(f"{last.get(stage, 0):>14.0f} ms" for stage in STAGES)
+            print(f"{route:>9} | {mock.request_count - before:>11} | {cells} | {question}")
+
+        mixed = QUESTIONS[-1]
+        cold_start()
+        sequential = sequential_contexts(mixed)
+        cold_start()
+        plan = handler.plan_query(mixed)
+        print(f"\nmixed contexts: sequential {sequential:.2f}s, concurrent {plan.timings['contexts']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# bench_rate_limit.py
+"""
+Fetches every PR's reviews from a mock whose quota is smaller than the job,
+with injected 502s, under three client settings:
+
+  no retries   - the old behaviour: the first 403/502 aborts the run
+  retry only   - backoff and wait for the reset once the quota is gone
+  retry + pace - also spread the remaining quota evenly until the reset
+
+Run from backend/:  python -m benchmarks.bench_rate_limit
+"""
+import os
+import time
+
+os.environ["GITHUB_CACHE"] = "0"
+
+from app import github_client
+from app.github_client import GitHubAPIError, fetch_reviews, quota_metrics
+from app.records import PullRecord
+from benchmarks.mock_github import MockGitHub
+
+SETTINGS = {
+    "no retries": {"MAX_RETRIES": 0, "PACE_BELOW": 0},
+    "retry only": {"MAX_RETRIES": 8, "PACE_BELOW": 0},
+    "retry + pace": {"MAX_RETRIES": 8, "PACE_BELOW": 10**9},
+}
+
+
+def run(name, num_prs, quota, window):
+    for attr, value in SETTINGS[name].items():
+        setattr(github_client, attr, value)
+    github_client.BACKOFF_BASE = 0.05
+    github_client.rate_limit.update(remaining=None, reset=None)
+    github_client._next_request_at.clear()
+    with MockGitHub(num_prs=num_prs, latency=0.005, quota=quota, window=window, fail_every=50) as mock:
+        github_client._repo_metrics.clear()
+        start = time.perf_counter()
+        try:
+            prs = fetch_reviews(PullRecord.from_github(pr) for pr in mock.prs)
+            done = sum(1 for pr in prs if pr.reviews)
+        except GitHubAPIError as e:
+            done = f"failed ({e.status})"
+        elapsed = time.perf_counter() - start
+        counters = quota_metrics()["repos"].get(f"{mock.owner}/{mock.repo}", {})
+        return done, mock.request_count, mock.throttled, counters.get("retries", 0), elapsed
+
+
+def main():
+    num_prs, quota, window = 400, 150, 3
+    print(f"{num_prs} PRs, quota {quota} requests per {window}s window, every 50th request a 502\n")
+    print(f"{'client':>12} | {'PRs w/ reviews':>14} | {'requests':>8} | {'403s':>5} | {'retries':>7} | {'time (s)':>8}")
+    for name in SETTINGS:
+        done, requests_made, throttled, retries, elapsed = run(name, num_prs, quota, window)
+        print(f"{name:>12} | {str(done):>14} | {requests_made:>8} | {throttled:>5} | {retries:>7} | {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
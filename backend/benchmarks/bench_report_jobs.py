@@ -0,0 +1,58 @@
+# bench_report_jobs.py
+"""
+Report throughput of the job queue by worker count: distinct full-table
+reports over one prefetched snapshot, plus a burst of duplicate requests
+that should collapse into a single job.
+
+Run from backend/:  python -m benchmarks.bench_report_jobs
+"""
+import time
+
+from app.pr_table import PRTable
+from app.records import RepoInfo
+from app.repo_snapshot import RepoSnapshot
+from app.report_jobs import ReportQueue
+from benchmarks.bench_pdf_tables import report_inputs
+
+REPORTS = 8
+NUM_PRS = 2000
+
+
+class StaticSnapshots:
+    def __init__(self, snapshot):
+        self.snapshot = snapshot
+
+    def get(self, owner, repo):
+        return self.snapshot
+
+
+def run(snapshots, workers, queries):
+    queue = ReportQueue(answer=lambda q, snapshot: {"description": q, "csv": []}, snapshots=snapshots, workers=workers)
+    queue.submit("warm-up", "mock-org", "mock-repo")[0].future.result()  # spawn the workers outside the timing
+    start = time.perf_counter()
+    jobs = {queue.submit(q, "mock-org", "mock-repo", full_tables=True)[0] for q in queries}
+    for job in jobs:
+        job.future.result()
+    elapsed = time.perf_counter() - start
+    stats = queue.stats()
+    queue.stop()
+    return elapsed, len(jobs), stats
+
+
+def main():
+    prs, issues = report_inputs(NUM_PRS)
+    info = RepoInfo.from_dict({"name": "mock-repo", "owner": "mock-org"})
+    snapshots = StaticSnapshots(RepoSnapshot("mock-org", "mock-repo", info, issues, PRTable.from_prs(prs), {}))
+
+    print(f"{REPORTS} full-table reports over {NUM_PRS} PRs\n")
+    print(f"{'workers':>7} | {'time (s)':>8} | {'reports/min':>11}")
+    for workers in (1, 2, 4):
+        elapsed, _, _ = run(snapshots, workers, [f"report {n}" for n in range(REPORTS)])
+        print(f"{workers:>7} | {elapsed:>8.2f} | {REPORTS / elapsed * 60:>11.1f}")
+
+    elapsed, jobs, stats = run(snapshots, 2, ["Which PRs merged without approval?"] * REPORTS)
+    print(f"\n{REPORTS} identical requests -> {jobs} job(s) in {elapsed:.2f}s, avg render {stats['avg_render_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+# bench_review_fetch.py
+"""
+Wall-clock comparison of sequential vs concurrent review fetching.
+
+Run from backend/:  python -m benchmarks.bench_review_fetch
+"""
+import time
+
+from app.github_client import fetch_reviews, MAX_WORKERS
+from app.records import PullRecord
+from benchmarks.mock_github import MockGitHub
+
+
+def timed(prs, workers):
+    start = time.perf_counter()
+    fetch_reviews(prs, max_workers=workers)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'PRs':>6} | {'sequential (s)':>14} | {f'{MAX_WORKERS} workers (s)':>14} | speedup")
+    for num_prs in (100, 250, 500, 1000):
+        with MockGitHub(num_prs=num_prs, latency=0.01) as mock:
+            prs = [PullRecord.from_github(pr) for pr in mock.prs]
+            sequential = timed(prs, 1)
+            concurrent = timed(prs, MAX_WORKERS)
+        print(f"{num_prs:>6} | {sequential:>14.2f} | {concurrent:>14.2f} | {sequential / concurrent:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
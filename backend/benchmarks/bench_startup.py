@@ -0,0 +1,52 @@
+# bench_startup.py
+"""
+Cold-start guard: imports main.py in a fresh interpreter under
+`python -X importtime`, reports the slowest imports and fails if startup is
+over budget or pulls in a heavy dependency that should load lazily.
+
+Run from backend/:  python -m benchmarks.bench_startup
+"""
+import os
+import subprocess
+import sys
+import time
+
+BUDGET_SECONDS = 1.0
+LAZY_MODULES = ("pandas", "numpy", "matplotlib", "reportlab", "google.generativeai")
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def main():
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        print(proc.stderr[-2000:])
+        sys.exit("import main failed")
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(cumulative), name.strip()))
+
+    print(f"interpreter + import main: {elapsed:.2f}s")
+    print("slowest imports (cumulative):")
+    for cumulative, name in sorted(imports, reverse=True)[:10]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    loaded = sorted({name for _, name in imports if name in LAZY_MODULES})
+    if loaded:
+        sys.exit(f"heavy modules imported at startup: {', '.join(loaded)}")
+    if elapsed > BUDGET_SECONDS:
+        sys.exit(f"startup took {elapsed:.2f}s, budget is {BUDGET_SECONDS:.1f}s")
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
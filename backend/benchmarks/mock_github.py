@@ -0,0 +1,308 @@
+# mock_github.py
+"""
+Minimal local stand-in for the GitHub REST and GraphQL APIs used by the benchmarks.
+
+Serves a synthetic repo with `num_prs` pull requests (and their reviews),
+issues and branches, adding `latency` seconds to every response to mimic
+the round trip to api.github.com. With `quota` set, REST requests are metered
+like GitHub's primary rate limit (X-RateLimit-* headers, 403 once exhausted,
+refilled every `window` seconds); `fail_every` turns every Nth request into a 502.
+"""
+import datetime
+import hashlib
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+REVIEWERS = ["alice", "bob", "carol", "dave", "erin"]
+
+# Rate-limit points GitHub would charge per page of each operation app/github_graphql.py sends
+GRAPHQL_COSTS = {"RepoInfo": 1, "RepoBranches": 1, "RepoIssues": 2, "RepoPulls": 1}
+
+
+def make_prs(base_url, owner, repo, num_prs):
+    now = datetime.datetime.utcnow()
+    prs = []
+    for n in range(num_prs, 0, -1):  # newest first, like GitHub
+        created = now - datetime.timedelta(hours=(num_prs - n + 1) * 7)
+        state = "open" if n % 4 == 0 else "closed"
+        merged = state == "closed" and n % 3 != 0
+        prs.append({
+            "url": f"{base_url}/repos/{owner}/{repo}/pulls/{n}",
+            "number": n,
+            "title": f"Synthetic change #{n}",
+            "state": state,
+            "user": {"login": REVIEWERS[(n + 1) % len(REVIEWERS)]},
+            "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updated_at": (created + datetime.timedelta(hours=3)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "merged_at": (created + datetime.timedelta(hours=2)).strftime("%Y-%m-%dT%H:%M:%SZ") if merged else None,
+            "merged_by": {"login": REVIEWERS[n % len(REVIEWERS)]} if merged else None,
+            "requested_reviewers": [] if n % 8 == 0 else [{"login": REVIEWERS[n % len(REVIEWERS)]}],
+        })
+    return prs
+
+
+def make_reviews(pr):
+    if pr["number"] % 5 == 0:
+        return []
+    return [{
+        "user": {"login": REVIEWERS[(pr["number"] + k) % len(REVIEWERS)]},
+        "state": "APPROVED" if k == 0 and pr["number"] % 2 else "COMMENTED",
+        "submitted_at": pr["created_at"],
+    } for k in range(2)]
+
+
+def make_issues(owner, repo, num_issues):
+    now = datetime.datetime.utcnow()
+    return [{
+        "number": n,
+        "title": f"Synthetic issue #{n}",
+        "state": "open" if n % 3 else "closed",
+        "assignee": {"login": REVIEWERS[n % len(REVIEWERS)]} if n % 2 else None,
+        "labels": [{"name": "bug"}] if n % 4 == 0 else [],
+        "created_at": (now - datetime.timedelta(days=num_issues - n + 1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "updated_at": (now - datetime.timedelta(days=num_issues - n + 1)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+    } for n in range(num_issues, 0, -1)]
+
+
+class MockGitHub:
+    def __init__(self, num_prs=100, num_issues=50, latency=0.01, owner="mock-org", repo="mock-repo", extra_repos=0,
+                 quota=None, window=60, fail_every=0):
+        self.owner = owner
+        self.quota = quota
+        self.window = window
+        self.fail_every = fail_every
+        self.remaining = quota
+        self.reset_at = time.time() + window
+        self.throttled = 0
+        self.repo = repo
+        self.latency = latency
+        self.request_count = 0
+        self.graphql_cost = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        # name -> (prs, issues); `repo` plus `extra_repos` siblings named repo-1, repo-2, ...
+        self.repos = {
+            name: (make_prs(self.base_url, owner, name, num_prs), make_issues(owner, name, num_issues))
+            for name in [repo] + [f"{repo}-{i}" for i in range(1, extra_repos + 1)]
+        }
+        self.prs, self.issues = self.repos[repo]
+        # (repo name, PR number) -> reviews submitted after start-up (see add_review)
+        self.added_reviews = {}
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def touch(self, kind, number, **changes):
+        """Simulates activity on a PR or issue by bumping its updated_at."""
+        items = self.prs if kind == "pulls" else self.issues
+        item = next(i for i in items if i["number"] == number)
+        item.update(changes, updated_at=datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"))
+
+    def add_review(self, number, login, state="APPROVED"):
+        """Submits a review on a PR of the main repo and bumps the PR's updated_at, like GitHub does."""
+        now = datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
+        self.added_reviews.setdefault((self.repo, number), []).append(
+            {"user": {"login": login}, "state": state, "submitted_at": now})
+        self.touch("pulls", number)
+
+    def _page(self, items, query, path):
+        if query.get("sort", [""])[0] == "updated":
+            items = sorted(items, key=lambda i: i["updated_at"], reverse=query.get("direction", ["desc"])[0] == "desc")
+        if "since" in query:
+            items = [i for i in items if i["updated_at"] >= query["since"][0]]
+        per_page = int(query.get("per_page", ["30"])[0])
+        page = int(query.get("page", ["1"])[0])
+        chunk = items[(page - 1) * per_page: page * per_page]
+        link = None
+        if page * per_page < len(items):
+            params = "&".join(f"{k}={v[0]}" for k, v in query.items() if k != "page")
+            link = f'<{self.base_url}{path}?{params}&page={page + 1}>; rel="next"'
+        return chunk, link
+
+    def route(self, path, query):
+        if path == f"/orgs/{self.owner}/repos":
+            listing = [{"name": name, "owner": {"login": self.owner}, "archived": False} for name in self.repos]
+            return self._page(listing, query, path)
+        parts = path.split("/")
+        if len(parts) < 4 or parts[1] != "repos" or parts[2] != self.owner or parts[3] not in self.repos:
+            return {"message": "Not Found"}, None
+        name = parts[3]
+        prs, issues = self.repos[name]
+        prefix = f"/repos/{self.owner}/{name}"
+        if path == prefix:
+            return {
+                "name": name, "owner": {"login": self.owner}, "description": "Mock repository",
+                "stargazers_count": 1, "forks_count": 0, "default_branch": "main",
+                "license": {"spdx_id": "MIT"},
+            }, None
+        if path == prefix + "/branches":
+            return [{"name": "main", "protected": True, "commit": {"sha": "0" * 40}}], None
+        if path == prefix + "/pulls":
+            return self._page(prs, query, path)
+        if path == prefix + "/issues":
+            return self._page(issues, query, path)
+        if path.startswith(prefix + "/pulls/") and path.endswith("/reviews"):
+            number = int(parts[-2])
+            return make_reviews(prs[len(prs) - number]) + self.added_reviews.get((name, number), []), None
+        return {"message": "Not Found"}, None
+
+    def graphql(self, query, variables):
+        """
+        Answers the operations in app/github_graphql.py from the same data the
+        REST routes serve. Cursors are plain offsets.
+        """
+        op = re.search(r"query (\w+)", query).group(1)
+        name = variables["repo"]
+        if variables["owner"] != self.owner or name not in self.repos:
+            return {"data": {"repository": None}, "errors": [{"message": "Could not resolve to a Repository"}]}
+        prs, issues = self.repos[name]
+        cost = GRAPHQL_COSTS[op]
+        with self._lock:
+            self.graphql_cost += cost
+        rate_limit = {"cost": cost, "remaining": 5000 - self.graphql_cost, "resetAt": "2030-01-01T00:00:00Z"}
+        if op == "RepoInfo":
+            repository = {
+                "name": name, "owner": {"login": self.owner}, "description": "Mock repository",
+                "stargazerCount": 1, "forkCount": 0, "defaultBranchRef": {"name": "main"},
+                "licenseInfo": {"spdxId": "MIT"},
+            }
+            return {"data": {"repository": repository, "rateLimit": rate_limit}}
+        if op == "RepoBranches":
+            items, first = [{"name": "main", "target": {"oid": "0" * 40}, "branchProtectionRule": {"id": "1"}}], 100
+        elif op == "RepoIssues":
+            items, first = [self._issue_node(i) for i in issues if i["updated_at"] >= (variables.get("since") or "")], 100
+        else:
+            items, first = [self._pull_node(pr) for pr in prs], int(re.search(r"pullRequests\(first: (\d+)", query).group(1))
+        if variables.get("orderField") == "UPDATED_AT":
+            items.sort(key=lambda i: i["updatedAt"], reverse=True)
+        start = int(variables.get("after") or 0)
+        page = {
+            "pageInfo": {"hasNextPage": start + first < len(items), "endCursor": str(start + first)},
+            "nodes": items[start:start + first],
+        }
+        return {"data": {"repository": {"page": page}, "rateLimit": rate_limit}}
+
+    @staticmethod
+    def _issue_node(i):
+        return {
+            "number": i["number"], "title": i["title"], "state": i["state"].upper(),
+            "createdAt": i["created_at"], "updatedAt": i["updated_at"],
+            "assignees": {"nodes": [i["assignee"]] if i["assignee"] else []},
+            "labels": {"nodes": i["labels"]},
+        }
+
+    @staticmethod
+    def _pull_node(pr):
+        reviews = make_reviews(pr)
+        return {
+            "number": pr["number"], "title": pr["title"],
+            "state": "MERGED" if pr["merged_at"] else pr["state"].upper(),
+            "createdAt": pr["created_at"], "updatedAt": pr["updated_at"], "mergedAt": pr["merged_at"],
+            "author": pr["user"], "mergedBy": pr["merged_by"],
+            "reviewRequests": {"nodes": [{"requestedReviewer": r} for r in pr["requested_reviewers"]]},
+            "reviews": {
+                "pageInfo": {"hasNextPage": False},
+                "nodes": [{"author": r["user"], "state": r["state"], "submittedAt": r["submitted_at"]} for r in reviews],
+            },
+        }
+
+    def meter(self):
+        """
+        Returns (status, headers) for the next REST request under the quota and
+        injected failures; status is None when the request should be served.
+        """
+        with self._lock:
+            if self.fail_every and self.request_count % self.fail_every == 0:
+                return 502, {}
+            if self.quota is None:
+                return None, {}
+            now = time.time()
+            if now >= self.reset_at:
+                self.remaining, self.reset_at = self.quota, now + self.window
+            status = None
+            if self.remaining == 0:
+                self.throttled += 1
+                status = 403
+            else:
+                self.remaining -= 1
+            return status, {
+                "X-RateLimit-Limit": str(self.quota),
+                "X-RateLimit-Remaining": str(self.remaining),
+                "X-RateLimit-Reset": str(int(self.reset_at + 0.999)),
+                "X-RateLimit-Resource": "core",
+            }
+
+    def _handler(self):
+        mock = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                with mock._lock:
+                    mock.request_count += 1
+                time.sleep(mock.latency)
+                status, limit_headers = mock.meter()
+                if status:
+                    message = "API rate limit exceeded" if status == 403 else "Bad Gateway"
+                    payload = json.dumps({"message": message}).encode()
+                    self.send_response(status)
+                    for name, value in limit_headers.items():
+                        self.send_header(name, value)
+                    self.send_header("Content-Length", str(len(payload)))
+                    self.end_headers()
+                    self.wfile.write(payload)
+                    return
+                parsed = urlparse(self.path)
+                body, link = mock.route(parsed.path, parse_qs(parsed.query))
+                payload = json.dumps(body).encode()
+                etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                for name, value in limit_headers.items():
+                    self.send_header(name, value)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if link:
+                    self.send_header("Link", link)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self):
+                with mock._lock:
+                    mock.request_count += 1
+                time.sleep(mock.latency)
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                if urlparse(self.path).path != "/graphql":
+                    payload = json.dumps({"message": "Not Found"}).encode()
+                else:
+                    payload = json.dumps(mock.graphql(request["query"], request.get("variables") or {})).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
@@ -1,15 +1,45 @@
 # main.py
+import asyncio
+import json
+import os
+import threading
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from app.pdf_generator import generate_pdf_from_response
-from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from app.pdf_generator import iter_pdf_chunks, shutdown_chart_pool
+from app.github_client import GitHubAPIError, quota_metrics
+from app.context_selector import metrics as context_metrics
+from app.inventory import metrics as inventory_metrics
+from app.query_router import classify, latency_breakdown
+from app.response_cache import get_response_cache
+from app.org_scan import ORG_SCAN_REPOS_IN_FLIGHT, scan_org
+from app.report_jobs import QueueFull, ReportQueue, remove_stale_dirs
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from pydantic import BaseModel, Field
 
 # Import your GitHub+Gemini logic
-from app.github_gemini_handler import run_query, generate_repo_context, generate_issue_context, fetch_repo_data # <-- rename your script to github_gemini_handler.py
+from app.github_gemini_handler import run_query, run_query_async, stream_query, snapshots, GITHUB_OWNER, GITHUB_REPO # <-- rename your script to github_gemini_handler.py
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app):
+    # Nothing heavy happens here: GitHub data is warmed from a background thread,
+    # and Gemini, pandas and matplotlib are initialised on first use.
+    remove_stale_dirs()
+    snapshots.start()
+    yield
+    snapshots.stop()
+    reports.stop()
+    shutdown_chart_pool()
+
+app = FastAPI(lifespan=lifespan)
+
+# PDF reports are built by a worker pool; /reports polls them, /query-pdf waits for one
+reports = ReportQueue(answer=run_query, snapshots=snapshots)
+
+# Seconds a single /query or /query-pdf may take before we give up on it
+QUERY_TIMEOUT = float(os.getenv("QUERY_TIMEOUT", "60"))
+ORG_SCAN_TIMEOUT = float(os.getenv("ORG_SCAN_TIMEOUT", "1800"))
 
 # Allow frontend (React/Postman) calls
 app.add_middleware(
@@ -20,6 +50,41 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+def github_error_content(exc):
+    return {"error": f"GitHub request failed: {exc.message}", "github_status": exc.status}
+
+@app.exception_handler(GitHubAPIError)
+async def github_error_handler(request: Request, exc: GitHubAPIError):
+    # Rate limited or GitHub down: tell the client when to come back instead of a bare 500
+    headers = {"Retry-After": str(int(exc.retry_after) + 1)} if exc.retry_after else None
+    status = 503 if exc.status in (403, 429) or exc.retry_after else 502
+    return JSONResponse(status_code=status, content=github_error_content(exc), headers=headers)
+
+async def cancel_on_disconnect(request, task):
+    while not task.done():
+        if await request.is_disconnected():
+            task.cancel()
+            return
+        await asyncio.sleep(0.5)
+
+async def run_for_request(request, coro, timeout=QUERY_TIMEOUT):
+    """
+    Awaits coro under `timeout`, cancelling it if the client goes away.
+    Returns (result, error_response).
+    """
+    task = asyncio.ensure_future(coro)
+    watcher = asyncio.ensure_future(cancel_on_disconnect(request, task))
+    try:
+        return await asyncio.wait_for(task, timeout), None
+    except asyncio.TimeoutError:
+        return None, JSONResponse(status_code=504, content={"error": f"Query timed out after {timeout:.0f}s"})
+    except asyncio.CancelledError:
+        if not task.cancelled():
+            raise
+        return None, Response(status_code=499)  # client closed the connection
+    finally:
+        watcher.cancel()
+
 @app.post("/query")
 async def query_api(request: Request):
     body = await request.json()
@@ -27,29 +92,151 @@ async def query_api(request: Request):
     if not user_query:
         return {"error": "Query is required"}
     
-    # Call your logic
-    result = run_query(user_query)
-    return {"query": user_query, "response": result}
+    # Call your logic without blocking the event loop
+    result, error = await run_for_request(request, run_query_async(user_query))
+    if error:
+        return error
+    # peek(): an inventory question must not trigger a crawl just to report the age
+    snapshot = snapshots.peek(GITHUB_OWNER, GITHUB_REPO)
+    return {
+        "query": user_query,
+        "route": classify(user_query),
+        "response": result,
+        "snapshot_age_seconds": round(snapshot.age(), 1) if snapshot else None,
+    }
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/query/stream")
+async def query_stream_api(request: Request):
+    """
+    Server-Sent Events: "token" events carry description text as it is
+    generated, "row" events each csv row as soon as it is complete, and a
+    final "result" event the parsed {description, csv}.
+    """
+    body = await request.json()
+    user_query = body.get("query")
+    if not user_query:
+        return JSONResponse(status_code=400, content={"error": "Query is required"})
+
+    async def events():
+        try:
+            async with asyncio.timeout(QUERY_TIMEOUT):
+                async for event, data in stream_query(user_query):
+                    yield sse_event(event, data)
+        except TimeoutError:
+            yield sse_event("error", {"error": f"Query timed out after {QUERY_TIMEOUT:.0f}s"})
+        except GitHubAPIError as e:
+            yield sse_event("error", github_error_content(e))
+        except Exception as e:
+            # Gemini/network/parser failure mid-stream: end with an error event, not a silently cut stream
+            print("❌ Streaming query failed:", repr(e))
+            yield sse_event("error", {"error": f"Query failed: {e}"})
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+class OrgAuditRequest(BaseModel):
+    org: str = Field(min_length=1)
+    reviewer: str | None = None
+    waiting_hours: float | None = Field(None, gt=0)
+    merged_days: int | None = Field(None, ge=1)
+    # Audit only the org's first N repos
+    max_repos: int | None = Field(None, ge=1)
+    # Repos audited at the same time
+    concurrency: int = Field(ORG_SCAN_REPOS_IN_FLIGHT, ge=1, le=32)
+
+@app.post("/org-audit")
+async def org_audit_api(body: OrgAuditRequest, request: Request):
+    """
+    Runs every audit rule across all repositories of a GitHub org and returns
+    the merged sections, e.g. {"org": "vulnerable-apps", "reviewer": "alice"}.
+    """
+    params = body.model_dump(include={"reviewer", "waiting_hours", "merged_days"}, exclude_none=True)
+    cancel = threading.Event()
+    scan = asyncio.to_thread(scan_org, body.org, max_repos=body.max_repos, max_in_flight=body.concurrency,
+                             cancel=cancel, **params)
+    try:
+        result, error = await run_for_request(request, scan, ORG_SCAN_TIMEOUT)
+    finally:
+        # The worker thread can't be cancelled: on timeout or disconnect, tell the scan to stop
+        cancel.set()
+    return error or result
+
+@app.get("/metrics")
+async def metrics_api():
+    response_cache = get_response_cache()
+    return {
+        "context_selection": context_metrics,
+        "inventory": inventory_metrics,
+        "routes": latency_breakdown(),
+        "response_cache": response_cache.hits if response_cache else None,
+        "github": quota_metrics(),
+        "reports": reports.stats(),
+    }
 
 class QueryRequest(BaseModel):
     query: str
+    # Append every PR, review, issue and audit finding as full tables
+    full_tables: bool = False
 
-@app.post("/query-pdf")
-async def query_and_get_pdf(request: QueryRequest):
-    response_text = run_query(request.query)
+def pdf_response(job):
+    pdf = reports.open_pdf(job)
+    if pdf is None:
+        return JSONResponse(status_code=410, content={"error": "Report expired, request it again"})
+    return StreamingResponse(iter_pdf_chunks(pdf), media_type="application/pdf", headers={
+        "Content-Disposition": 'attachment; filename="audit_report.pdf"',
+        "Content-Length": str(job.size),
+    })
 
-    # Repo metadata + issues + PRs
-    repo_stats = generate_repo_context("vulnerable-apps", "juice-shop")
-    issues = generate_issue_context("vulnerable-apps", "juice-shop")
-    prs = fetch_repo_data("vulnerable-apps", "juice-shop")
+async def submit_report(request: QueryRequest):
+    """Returns (job, deduplicated, error_response)."""
+    try:
+        job, deduplicated = await asyncio.to_thread(reports.submit, request.query, GITHUB_OWNER, GITHUB_REPO, request.full_tables)
+    except QueueFull as e:
+        return None, False, JSONResponse(status_code=503, content={"error": str(e)}, headers={"Retry-After": "30"})
+    return job, deduplicated, None
 
-    response_data = {
-        "query": request.query,
-        "response": response_text
-    }
+@app.post("/reports", status_code=202)
+async def create_report(request: QueryRequest):
+    """
+    Queues a PDF report and returns its job id straight away; poll
+    GET /reports/{job_id} and download from GET /reports/{job_id}/pdf.
+    """
+    job, deduplicated, error = await submit_report(request)
+    if error:
+        return error
+    return {**job.to_dict(), "deduplicated": deduplicated}
 
-    pdf_file = generate_pdf_from_response(response_data, repo_stats, issues, prs)
-    return FileResponse(pdf_file, media_type="application/pdf", filename="audit_report.pdf")
+@app.get("/reports/{job_id}")
+async def report_status(job_id: str):
+    job = reports.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Unknown report job"})
+    return job.to_dict()
+
+@app.get("/reports/{job_id}/pdf")
+async def report_pdf(job_id: str):
+    job = reports.get(job_id)
+    if job is None:
+        return JSONResponse(status_code=404, content={"error": "Unknown report job"})
+    if job.status != "done":
+        return JSONResponse(status_code=409, content=job.to_dict())
+    return pdf_response(job)
+
+@app.post("/query-pdf")
+async def query_and_get_pdf(request: QueryRequest, http_request: Request):
+    # Same job queue as /reports, but the response waits for the finished PDF.
+    # shield(): a timeout or disconnect here must not cancel a job others may share.
+    job, _, error = await submit_report(request)
+    if error:
+        return error
+    _, error = await run_for_request(http_request, asyncio.shield(asyncio.wrap_future(job.future)))
+    if error:
+        return error
+    if job.status != "done":
+        return JSONResponse(status_code=500, content=job.to_dict())
+    return pdf_response(job)
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)